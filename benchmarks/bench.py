@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import functools
+import heapq
+import itertools
+import json
+import operator
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from collections import namedtuple
+
+from pipez import seq, opt, agg
+from pipez.functions import to_unary, do_nothing, identity
+from pipez.operators import add, mul
+from pipez.pipe import Pipeline
+from pipez.predicates import ge, lt, ne, eq, gt, is_none
+
+Case = namedtuple('Case', 'name setup pipez raw')
+
+CASES = []
+
+SIZES = (10, 1_000, 100_000)
+
+
+def numbers(size):
+    return list(range(size))
+
+
+def words(size):
+    return [str(i) for i in range(size)]
+
+
+def nested(size):
+    return [[i, i + 1, i + 2] for i in range(size // 3 + 1)]
+
+
+def pairs(size):
+    return [(i % 100, i) for i in range(size)]
+
+
+def sorted_keys(size):
+    return [i // 10 for i in range(size)]
+
+
+def bench(name, pipez, raw, setup=numbers):
+    CASES.append(Case(name, setup, pipez, raw))
+
+
+def sqr(x):
+    return x * x
+
+
+def is_even(x):
+    return x % 2 == 0
+
+
+def consume(iterable):
+    for _ in iterable:
+        pass
+
+
+async def aconsume(aiterable):
+    async for _ in aiterable:
+        pass
+
+
+async def alist(aiterable):
+    return [item async for item in aiterable]
+
+
+async def araw(iterable):
+    for item in iterable:
+        yield item
+
+
+def has_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return False
+    return True
+
+
+# seq primitives
+bench('seq.len', lambda d: d >> seq.len(), lambda d: sum(1 for _ in d))
+bench('seq.map', lambda d: consume(d >> seq.map(sqr)), lambda d: consume(sqr(x) for x in d))
+bench('seq.bind', lambda d: consume(d >> seq.bind(sqr)), lambda d: consume(sqr(x) for x in d))
+bench('seq.filter', lambda d: consume(d >> seq.filter(is_even)), lambda d: consume(x for x in d if is_even(x)))
+bench('seq.take_if', lambda d: consume(d >> seq.take_if(is_even)), lambda d: consume(filter(is_even, d)))
+bench('seq.drop_if', lambda d: consume(d >> seq.drop_if(is_even)), lambda d: consume(x for x in d if not is_even(x)))
+bench('seq.take', lambda d: consume(d >> seq.take(5)), lambda d: consume(itertools.islice(d, 5)))
+bench('seq.drop', lambda d: consume(d >> seq.drop(5)), lambda d: consume(itertools.islice(d, 5, None)))
+bench('seq.slice', lambda d: consume(d >> seq.slice(5, None, 2)), lambda d: consume(itertools.islice(d, 5, None, 2)))
+bench('seq.step', lambda d: consume(d >> seq.step(3)), lambda d: consume(itertools.islice(d, None, None, 3)))
+bench('seq.take_while', lambda d: consume(d >> seq.take_while(ge(0))), lambda d: consume(itertools.takewhile(lambda x: x >= 0, d)))
+bench('seq.drop_while', lambda d: consume(d >> seq.drop_while(lt(0))), lambda d: consume(itertools.dropwhile(lambda x: x < 0, d)))
+bench('seq.take_until', lambda d: consume(d >> seq.take_until(lt(0))),
+      lambda d: consume(itertools.takewhile(lambda x: not x < 0, d)))
+bench('seq.drop_until', lambda d: consume(d >> seq.drop_until(ge(0))),
+      lambda d: consume(itertools.dropwhile(lambda x: not x >= 0, d)))
+bench('seq.enumerate', lambda d: consume(d >> seq.enumerate()), lambda d: consume(enumerate(d)))
+bench('seq.reverse', lambda d: consume(d >> seq.reverse()), lambda d: consume(reversed(d)))
+bench('seq.sort', lambda d: d >> seq.sort(reverse=True), lambda d: sorted(d, reverse=True))
+bench('seq.zip_with', lambda d: consume(d >> seq.zip_with(d)), lambda d: consume(zip(d, d)))
+bench('seq.flatten', lambda d: consume(d >> seq.flatten()), lambda d: consume(x for xs in d for x in xs), nested)
+bench('seq.flat_map', lambda d: consume(d >> seq.flat_map(lambda x: (x, x))), lambda d: consume(y for x in d for y in (x, x)))
+bench('seq.filter_map', lambda d: consume(d >> seq.filter_map(lambda x: x if x % 2 else None)),
+      lambda d: consume(y for y in (x if x % 2 else None for x in d) if y is not None))
+bench('seq.tee', lambda d: [consume(t) for t in d >> seq.tee(2)], lambda d: [consume(t) for t in itertools.tee(d, 2)])
+bench('seq.partition', lambda d: [consume(t) for t in d >> seq.partition(is_even)],
+      lambda d: ([x for x in d if is_even(x)], [x for x in d if not is_even(x)]))
+bench('seq.tee.bounded', lambda d: [consume(t) for t in d >> seq.tee(2, max_buffer=1_000, spill=True)],
+      lambda d: [consume(t) for t in itertools.tee(d, 2)])
+bench('seq.partition.bounded', lambda d: [consume(t) for t in d >> seq.partition(is_even, max_buffer=1_000, spill=True)],
+      lambda d: ([x for x in d if is_even(x)], [x for x in d if not is_even(x)]))
+bench('seq.partition_into', lambda d: d >> seq.partition_into(is_even, do_nothing, do_nothing),
+      lambda d: [(do_nothing if is_even(x) else do_nothing)(x) for x in d])
+bench('seq.for_each', lambda d: d >> seq.for_each(do_nothing), lambda d: [do_nothing(x) for x in d])
+bench('seq.inspect', lambda d: consume(d >> seq.inspect(do_nothing)), lambda d: consume(x for x in d if do_nothing(x) or True))
+bench('seq.join', lambda d: d >> seq.join(','), lambda d: ','.join(map(str, d)))
+bench('seq.to', lambda d: d >> seq.to(tuple), lambda d: tuple(d))
+bench('seq.to_list', lambda d: d >> seq.to_list(), lambda d: list(d))
+bench('seq.to_set', lambda d: d >> seq.to_set(), lambda d: set(d))
+bench('seq.to_tuple', lambda d: d >> seq.to_tuple(), lambda d: tuple(d))
+bench('seq.to_dict', lambda d: d >> seq.to_dict(), lambda d: dict(d), pairs)
+bench('seq.to_multidict', lambda d: d >> seq.to_multidict(),
+      lambda d: functools.reduce(lambda res, kv: res.setdefault(kv[0], []).append(kv[1]) or res, d, {}), pairs)
+bench('seq.reduce', lambda d: d >> seq.reduce(operator.add, 0), lambda d: functools.reduce(operator.add, d, 0))
+bench('seq.sum', lambda d: d >> seq.sum(), lambda d: sum(d))
+bench('seq.min', lambda d: d >> seq.min(), lambda d: min(d))
+bench('seq.max', lambda d: d >> seq.max(key=sqr), lambda d: max(d, key=sqr))
+bench('seq.first', lambda d: d >> seq.first(), lambda d: next(iter(d), None))
+bench('seq.nth', lambda d: d >> seq.nth(5), lambda d: next(itertools.islice(d, 5, None), None))
+bench('seq.count_if', lambda d: d >> seq.count_if(is_even), lambda d: sum(1 for x in d if is_even(x)))
+bench('seq.extend', lambda d: consume(d >> seq.extend(d)), lambda d: consume(itertools.chain(d, d)))
+bench('seq.chunk', lambda d: consume(d >> seq.chunk(64)), lambda d: consume(d[i:i + 64] for i in range(0, len(d), 64)))
+bench('seq.unbatch', lambda d: consume(d >> seq.unbatch()), lambda d: consume(itertools.chain.from_iterable(d)), nested)
+bench('seq.batch_map', lambda d: consume(d >> seq.batch_map(lambda b: [sqr(x) for x in b], size=64)),
+      lambda d: consume(sqr(x) for x in d))
+bench('seq.nsmallest', lambda d: d >> seq.nsmallest(10), lambda d: heapq.nsmallest(10, d))
+bench('seq.nlargest', lambda d: d >> seq.nlargest(10), lambda d: heapq.nlargest(10, d))
+bench('seq.external_sort', lambda d: consume(d >> seq.external_sort(reverse=True, max_items_in_memory=10_000)),
+      lambda d: sorted(d, reverse=True))
+bench('seq.group_by', lambda d: d >> seq.group_by(lambda x: x % 10, agg.sum()),
+      lambda d: functools.reduce(lambda res, x: res.__setitem__(x % 10, res.get(x % 10, 0) + x) or res, d, {}))
+bench('seq.group_adjacent', lambda d: consume(d >> seq.group_adjacent(identity, agg.count())),
+      lambda d: consume((k, sum(1 for _ in g)) for k, g in itertools.groupby(d)), sorted_keys)
+bench('seq.columns', lambda d: d >> seq.columns(operator.itemgetter(0), operator.itemgetter(1)),
+      lambda d: ([x[0] for x in d], [x[1] for x in d]), pairs)
+bench('seq.aggregate', lambda d: d >> seq.aggregate(total=seq.sum(), lo=seq.min(), hi=seq.max(), n=seq.len()),
+      lambda d: {'total': sum(d), 'lo': min(d), 'hi': max(d), 'n': len(d)})
+bench('seq.pmap', lambda d: consume(d >> seq.pmap(sqr, workers=4, chunksize=256)), lambda d: consume(map(sqr, d)))
+bench('seq.pfilter', lambda d: consume(d >> seq.pfilter(is_even, workers=4, chunksize=256)),
+      lambda d: consume(filter(is_even, d)))
+
+# async stages, each measured with its own event loop
+bench('seq.amap', lambda d: asyncio.run(aconsume(d >> seq.amap(sqr))),
+      lambda d: asyncio.run(aconsume(sqr(x) async for x in araw(d))))
+bench('seq.afilter', lambda d: asyncio.run(aconsume(d >> seq.afilter(is_even))),
+      lambda d: asyncio.run(aconsume(x async for x in araw(d) if is_even(x))))
+bench('seq.atake', lambda d: asyncio.run(aconsume(d >> seq.atake(5))),
+      lambda d: asyncio.run(aconsume(x async for x, _ in araw(zip(d, range(5))))))
+bench('seq.ato_list', lambda d: asyncio.run(d >> seq.ato_list()),
+      lambda d: asyncio.run(alist(araw(d))))
+bench('seq.afor_each', lambda d: asyncio.run(d >> seq.afor_each(do_nothing)),
+      lambda d: asyncio.run(aconsume(do_nothing(x) async for x in araw(d))))
+
+# numpy backed stages, compared against numpy itself
+if has_numpy():
+    import numpy
+
+    bench('seq.vectorize', lambda d: d >> seq.vectorize() >> seq.map(mul(2)) >> seq.sum(), lambda d: int((numpy.asarray(d) * 2).sum()))
+    bench('seq.from_array', lambda a: seq.from_array(a) >> seq.take_if(gt(10)) >> seq.len(), lambda a: len(a[a > 10]),
+          lambda size: numpy.arange(size))
+
+# deep pipelines
+DEEP = (seq.map(add(1)) >> seq.filter(ne(3)) >> seq.map(mul(2)) >> seq.filter(is_even)
+        >> seq.map(sqr) >> seq.take_while(ge(0)) >> seq.map(add(-1)) >> seq.filter(gt(-10))
+        >> seq.map(str) >> seq.map(len) >> seq.filter(ge(1)) >> seq.sum())
+
+
+def deep_raw(d):
+    return sum(len(str(sqr(2 * (x + 1)) - 1)) for x in d if x + 1 != 3)
+
+
+bench('pipeline.deep', lambda d: d >> DEEP, deep_raw)
+bench('pipeline.deep.compiled', functools.partial(Pipeline.__call__, DEEP.compile()), deep_raw)
+bench('pipeline.construction', lambda d: [seq.map(sqr) >> seq.filter(is_even) >> seq.take(3) >> seq.to_list() for _ in d],
+      lambda d: [(sqr, is_even, 3, list) for _ in d], lambda size: range(min(size, 10_000)))
+
+bench('stage.construction', lambda d: [seq.take(3) >> seq.first() for _ in d],
+      lambda d: [(3, next) for _ in d], lambda size: range(min(size, 10_000)))
+
+# predicate trees
+PRED = (ge(0) & lt(1_000_000) & ne(3)) | eq(-9) | ~is_none & gt(10 ** 9)
+
+
+def pred_raw(x):
+    return (x >= 0 and x < 1_000_000 and x != 3) or x == -9 or (x is not None and x > 10 ** 9)
+
+
+bench('predicates.tree', lambda d: consume(d >> seq.filter(PRED)), lambda d: consume(x for x in d if pred_raw(x)))
+
+# to_unary construction
+bench('functions.to_unary', lambda d: [to_unary(lambda a, b: a) for _ in d], lambda d: [(lambda a, b: a) for _ in d],
+      lambda size: range(min(size, 10_000)))
+
+# opt chains
+OPT = opt.map(sqr) >> opt.filter(is_even) >> opt.map(add(1)) >> opt.value_or(0)
+bench('opt.chain', lambda d: [x >> OPT for x in d], lambda d: [sqr(x) + 1 if x is not None and is_even(sqr(x)) else 0 for x in d])
+
+
+def uncovered():
+    benchmarked = {case.name.split('.')[1] for case in CASES if case.name.startswith('seq.')}
+    return sorted(name for name in dir(seq) if not name.startswith('_') and name not in benchmarked)
+
+
+def measure(func, data, min_time):
+    timer = timeit.Timer(lambda: func(data))
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    return min([elapsed] + timer.repeat(repeat=2, number=number)) / number
+
+
+def peak_memory(func, data):
+    tracemalloc.start()
+    try:
+        func(data)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(cases, sizes, min_time):
+    for case in cases:
+        for size in sizes:
+            data = case.setup(size)
+            pipez_time = measure(case.pipez, data, min_time)
+            raw_time = measure(case.raw, data, min_time)
+            yield {
+                'name': case.name,
+                'size': size,
+                'pipez': pipez_time,
+                'raw': raw_time,
+                'overhead': pipez_time / raw_time if raw_time else None,
+                'pipez_peak_bytes': peak_memory(case.pipez, data),
+                'raw_peak_bytes': peak_memory(case.raw, data),
+            }
+
+
+def compare(results, baseline, threshold):
+    previous = {(r['name'], r['size']): r['pipez'] for r in baseline['results']}
+    for r in results:
+        before = previous.get((r['name'], r['size']))
+        if before and r['pipez'] > threshold * before:
+            yield r, r['pipez'] / before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark pipez against raw itertools/comprehension code. '
+                                                 'Run from the repository root: python -m benchmarks.bench')
+    parser.add_argument('--output', '-o', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio reported as a regression')
+    parser.add_argument('--filter', '-k', default='', help='run only cases whose name contains this text')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--min-time', type=float, default=0.05, help='minimal measured time per sample in seconds')
+    args = parser.parse_args(argv)
+
+    if missing := uncovered():
+        print(f'stages without a benchmark: {", ".join(missing)}', file=sys.stderr)
+
+    cases = [c for c in CASES if args.filter in c.name]
+    results = []
+    for r in run(cases, args.sizes, args.min_time):
+        results.append(r)
+        print(f'{r["name"]:<28} {r["size"]:>8}  pipez {r["pipez"] * 1e6:12.2f} us'
+              f'  raw {r["raw"] * 1e6:12.2f} us  x{r["overhead"]:.2f}'
+              f'  peak {r["pipez_peak_bytes"]:>10} B / {r["raw_peak_bytes"]:>10} B')
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            regressions = list(compare(results, json.load(file), args.threshold))
+        for r, ratio in regressions:
+            print(f'REGRESSION {r["name"]} size={r["size"]}: x{ratio:.2f} slower than baseline')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,11 @@
+import bisect
+import collections
 import dataclasses
 import functools
 import itertools
 import operator
+import re
+import types
 import typing
 from abc import abstractmethod, ABC
 from dataclasses import dataclass
@@ -15,35 +19,56 @@ class Token:
     pos: Position
 
 
+class Source:
+    def __init__(self, text: str, memo: 'Memo' = None):
+        self.text = text
+        self.memo = memo
+        self._newlines = None
+
+    def position(self, index: int) -> Position:
+        if self._newlines is None:
+            self._newlines = [i for i, ch in enumerate(self.text) if ch == '\n']
+        line = bisect.bisect_left(self._newlines, index)
+        return line, index - (self._newlines[line - 1] + 1 if line else 0)
+
+
 class Stream:
-    def __init__(self, text: str, index: int = None, pos: Position = None):
-        self._text = text
-        self._index = index or 0
-        self.pos = pos or (0, 0)
+    __slots__ = ('_source', '_text', '_index')
+
+    def __init__(self, text: typing.Union[str, Source], index: int = 0, memo: 'Memo' = None):
+        self._source = text if isinstance(text, Source) else Source(text, memo)
+        self._text = self._source.text
+        self._index = min(index, len(self._text))
 
     def __bool__(self):
         return self._index < len(self._text)
 
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def pos(self) -> Position:
+        return self._source.position(self._index)
+
     @property
     def content(self) -> str:
         return self._text[self._index:]
 
+    def startswith(self, prefix: str) -> bool:
+        return self._text.startswith(prefix, self._index)
+
     def peek(self) -> Token:
         return Token(text=self._text[self._index], pos=self.pos)
 
-    def advance(self, count: int):
-        res = Stream(text=self._text, index=self._index, pos=self.pos)
-        while res and count > 0:
-            if res._text[res._index] == '\n':
-                res.pos = res.pos[0] + 1, 0
-            else:
-                res.pos = res.pos[0], res.pos[1] + 1
-            res._index += 1
-            count -= 1
-        return res
+    def current(self) -> str:
+        return self._text[self._index]
+
+    def advance(self, count: int) -> 'Stream':
+        return Stream(self._source, self._index + count)
 
     def take(self, count: int) -> tuple[Token, 'Stream']:
-        token = Token(self.content[:count], pos=self.pos)
+        token = Token(self._text[self._index:self._index + count], pos=self.pos)
         remainder = self.advance(count)
         return token, remainder
 
@@ -58,6 +83,71 @@ class ParseResult:
     parser: 'Parser'
 
 
+class _Seed:
+    def __init__(self):
+        self.result = None
+        self.used = False
+
+
+class Memo:
+    def __init__(self, max_positions: int = 4096):
+        self.max_positions = max_positions
+        self._results = collections.OrderedDict()
+        self._growing = {}
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._results.values())
+
+    def _lookup(self, parser, index):
+        entries = self._results.get(index)
+        if entries is not None and parser in entries:
+            self._results.move_to_end(index)
+            return True, entries[parser]
+        return False, None
+
+    def _store(self, parser, index, res):
+        entries = self._results.get(index)
+        if entries is None:
+            entries = self._results[index] = {}
+            if len(self._results) > self.max_positions:
+                self._results.popitem(last=False)
+        else:
+            self._results.move_to_end(index)
+        entries[parser] = res
+
+    def parse(self, parser: 'Parser', stream: Stream, parse) -> typing.Optional[ParseResult]:
+        key = parser, stream.index
+        seed = self._growing.get(key)
+        if seed is not None:
+            seed.used = True
+            return seed.result
+        found, res = self._lookup(*key)
+        if found:
+            return res
+        seed = self._growing[key] = _Seed()
+        try:
+            res = parse(stream)
+            if seed.used:
+                # left recursion: grow the seed until the rule stops consuming more input
+                while res is not None and (seed.result is None
+                                           or res.remainder.index > seed.result.remainder.index):
+                    seed.result = res
+                    self._results.pop(stream.index, None)
+                    res = parse(stream)
+                res = seed.result
+        finally:
+            del self._growing[key]
+        self._store(*key, res)
+        return res
+
+
+def _packrat(parser: 'Parser', stream: Stream, parse) -> typing.Optional[ParseResult]:
+    memo = stream._source.memo
+    if memo is None:
+        return parse(stream)
+    return memo.parse(parser, stream, parse)
+
+
 class Parser(ABC):
     @abstractmethod
     def parse(self, stream: Stream) -> typing.Optional[ParseResult]:
@@ -66,6 +156,18 @@ class Parser(ABC):
     def alias(self, name):
         return Alias(self, name)
 
+    def compile(self) -> 'CompiledParser':
+        return CompiledParser(self)
+
+    def _alternatives(self) -> list[tuple['Parser', typing.Optional['Parser']]]:
+        return [(self, self)]
+
+    def _pattern(self, compiler: 'CompiledParser') -> str:
+        raise TypeError(f'{self!r} cannot be compiled to a regular expression')
+
+    def _converter(self) -> typing.Optional[typing.Callable[[str], str]]:
+        return None
+
 
 class Alias(Parser):
     def __init__(self, parser: Parser, name: str):
@@ -74,6 +176,9 @@ class Alias(Parser):
         self._name = name
 
     def parse(self, stream: Stream) -> typing.Optional[ParseResult]:
+        return _packrat(self, stream, self._parse)
+
+    def _parse(self, stream: Stream) -> typing.Optional[ParseResult]:
         res = self._parser.parse(stream)
         if res is not None:
             return ParseResult(token=res.token,
@@ -82,19 +187,53 @@ class Alias(Parser):
         else:
             return None
 
+    def _alternatives(self):
+        return [(self, self._parser)]
+
+    def _pattern(self, compiler):
+        return self._parser._pattern(compiler)
+
+    def _converter(self):
+        return self._parser._converter()
+
     def __repr__(self):
         return self._name
 
 
+class Rule(Alias):
+    def __init__(self, name: str, parser: Parser = None):
+        self._parser = None
+        self._name = name
+        self._compiling = False
+        if parser is not None:
+            self.define(parser)
+
+    def define(self, parser: Parser) -> 'Rule':
+        assert isinstance(parser, Parser)
+        self._parser = parser
+        return self
+
+    def _pattern(self, compiler):
+        if self._compiling:
+            raise TypeError(f'{self!r} is recursive and cannot be compiled to a regular expression')
+        self._compiling = True
+        try:
+            return super()._pattern(compiler)
+        finally:
+            self._compiling = False
+
+
 class Char(Parser):
     def __init__(self, pred: typing.Callable[[str], bool]):
         if callable(pred):
             self._pred = pred
+            self._char = None
         else:
             self._pred = lambda ch: ch == pred
+            self._char = pred
 
     def parse(self, stream: Stream) -> typing.Optional[ParseResult]:
-        if stream and self._pred(stream.peek().text):
+        if stream and self._pred(stream.current()):
             token, remainder = stream.take(1)
             return ParseResult(token=token,
                                remainder=remainder,
@@ -102,13 +241,18 @@ class Char(Parser):
         else:
             return None
 
+    def _pattern(self, compiler):
+        if self._char is None:
+            return compiler.char_class(self._pred)
+        return re.escape(self._char) if len(self._char) == 1 else '(?!)'
+
 
 class String(Parser):
     def __init__(self, string):
         self._string = string
 
     def parse(self, stream: Stream) -> typing.Optional[ParseResult]:
-        if stream and stream.content.startswith(self._string):
+        if stream and stream.startswith(self._string):
             token, remainder = stream.take(len(self._string))
             return ParseResult(token=token,
                                remainder=remainder,
@@ -116,6 +260,9 @@ class String(Parser):
         else:
             return None
 
+    def _pattern(self, compiler):
+        return re.escape(self._string)
+
 
 class Any(Parser):
     def __init__(self, *parsers: Parser):
@@ -129,6 +276,12 @@ class Any(Parser):
                 return res
         return None
 
+    def _alternatives(self):
+        return [alternative for parser in self._parsers for alternative in parser._alternatives()]
+
+    def _pattern(self, compiler):
+        return compiler.atomic('|'.join(compiler.nested(p) for p in self._parsers))
+
 
 class Seq(Parser):
     def __init__(self, *parsers: Parser):
@@ -150,15 +303,19 @@ class Seq(Parser):
                            remainder=remainder,
                            parser=self)
 
+    def _pattern(self, compiler):
+        return ''.join(f'(?:{compiler.nested(p)})' for p in self._parsers)
+
+
+def _at_least_one(count: int) -> bool:
+    return count > 0
+
 
 class Repeat(Parser):
     def __init__(self, parser: Parser, pred: typing.Callable[[int], bool] = None):
         assert isinstance(parser, Parser)
         self._parser = parser
-        if pred is not None:
-            self._pred = pred
-        else:
-            self._pred = lambda n: n > 0
+        self._pred = pred if pred is not None else _at_least_one
 
     def parse(self, stream: Stream) -> typing.Optional[ParseResult]:
         count = 0
@@ -181,6 +338,11 @@ class Repeat(Parser):
         else:
             return None
 
+    def _pattern(self, compiler):
+        if self._pred is not _at_least_one:
+            return super()._pattern(compiler)
+        return compiler.atomic(f'(?:{compiler.nested(self._parser)})+')
+
 
 class Optional(Parser):
     def __init__(self, parser: Parser):
@@ -196,39 +358,163 @@ class Optional(Parser):
                                remainder=stream,
                                parser=self)
 
+    def _alternatives(self):
+        return self._parser._alternatives() + [(self, None)]
+
+    def _pattern(self, compiler):
+        return compiler.atomic(f'(?:{compiler.nested(self._parser)})?')
+
 
 class QuotedString(Parser):
     QUOTATION_MARK = '"'
 
     def parse(self, stream: Stream) -> typing.Optional[ParseResult]:
-        if stream.peek().text != type(self).QUOTATION_MARK:
+        quotation_mark = type(self).QUOTATION_MARK
+        if not stream or stream.current() != quotation_mark:
             return None
-        result = type(self).QUOTATION_MARK
+        result = [quotation_mark]
         remainder = stream.advance(1)
         while remainder:
-            if remainder.content.startswith('\\' + type(self).QUOTATION_MARK):
-                result += type(self).QUOTATION_MARK
+            if remainder.startswith('\\' + quotation_mark):
+                result.append(quotation_mark)
                 remainder = remainder.advance(2)
-            elif remainder.content[0] == type(self).QUOTATION_MARK:
-                result += type(self).QUOTATION_MARK
+            elif remainder.current() == quotation_mark:
+                result.append(quotation_mark)
                 remainder = remainder.advance(1)
                 break
             else:
-                result += remainder.peek().text
+                result.append(remainder.current())
                 remainder = remainder.advance(1)
-        return ParseResult(token=Token(text=result, pos=stream.peek().pos),
+        return ParseResult(token=Token(text=''.join(result), pos=stream.pos),
                            remainder=remainder,
                            parser=self)
 
+    def _pattern(self, compiler):
+        quotation_mark = re.escape(type(self).QUOTATION_MARK)
+        body = compiler.atomic(f'(?:\\\\{quotation_mark}|[^{quotation_mark}])*')
+        return f'{quotation_mark}{body}{quotation_mark}?'
+
+    def _converter(self):
+        quotation_mark = type(self).QUOTATION_MARK
+        return lambda text: text.replace('\\' + quotation_mark, quotation_mark)
+
     def __repr__(self):
         return 'QuotedString'
 
 
+class CompiledParser(Parser):
+    def __init__(self, parser: Parser):
+        assert isinstance(parser, Parser)
+        self._parser = parser
+        self._branches = parser._alternatives()
+        self._groups = {}
+        self._classes = {}
+        self._alphabet = set()
+        self._source = None
+        self._regex = None
+        self._atomic_groups = 0
+        self._build()
+
+    def char_class(self, pred: typing.Callable[[str], bool]) -> str:
+        try:
+            chars = self._classes[pred]
+        except KeyError:
+            chars = self._classes[pred] = {ch for ch in self._alphabet if pred(ch)}
+        return '[' + ''.join(sorted(map(re.escape, chars))) + ']' if chars else '(?!)'
+
+    def atomic(self, pattern: str) -> str:
+        # (?>...) and possessive quantifiers need Python 3.11; a lookahead followed by a backreference
+        # to what it captured matches the same text and cannot be backtracked into either
+        self._atomic_groups += 1
+        name = f'_atomic{self._atomic_groups}'
+        return f'(?=(?P<{name}>{pattern}))(?P={name})'
+
+    def nested(self, parser: Parser) -> str:
+        if parser._converter() is not None:
+            raise TypeError(f'{parser!r} can only be compiled as a top level alternative')
+        return parser._pattern(self)
+
+    def _build(self):
+        self._groups = {}
+        self._atomic_groups = 0
+        patterns = []
+        for i, (parser, node) in enumerate(self._branches):
+            name = f'_{i}'
+            self._groups[name] = parser, node._converter() if node is not None else None
+            patterns.append(f'(?P<{name}>{node._pattern(self) if node is not None else ""})')
+        self._regex = re.compile('|'.join(patterns))
+
+    def _prepare(self, stream: Stream):
+        if stream._source is self._source and self._regex is not None:
+            return
+        self._source = stream._source
+        new = set(stream._text) - self._alphabet
+        self._alphabet |= new
+        changed = False
+        for pred, chars in self._classes.items():
+            accepted = {ch for ch in new if pred(ch)}
+            if accepted:
+                chars |= accepted
+                changed = True
+        if changed or self._regex is None:
+            self._build()
+
+    def _match(self, text: str, index: int):
+        m = self._regex.match(text, index)
+        if m is None:
+            return None
+        parser, converter = self._groups[m.lastgroup]
+        value = m.group()
+        return parser, value if converter is None else converter(value), m.end()
+
+    def parse(self, stream: Stream) -> typing.Optional[ParseResult]:
+        self._prepare(stream)
+        res = self._match(stream._text, stream.index)
+        if res is None:
+            return None
+        parser, text, end = res
+        return ParseResult(token=Token(text=text, pos=stream.pos),
+                           remainder=Stream(stream._source, end),
+                           parser=parser)
+
+    def scan(self, stream: Stream) -> typing.Iterator[tuple[Parser, Token]]:
+        self._prepare(stream)
+        source, text, index = stream._source, stream._text, stream.index
+        while index < len(text):
+            res = self._match(text, index)
+            if res is None:
+                break
+            parser, value, end = res
+            yield parser, Token(text=value, pos=source.position(index))
+            index = end
+
+    def compile(self) -> 'CompiledParser':
+        return self
+
+    def __repr__(self):
+        return f'CompiledParser({self._parser!r})'
+
+
+# bumped whenever any Env binds a builtin name; compiled code folds builtins into constants only while it is unchanged
+_builtins_version = [0]
+
+
 class Env(dict):
     def __init__(self, values, outer=None):
         self.update(values)
         self.outer = outer
 
+    def __setitem__(self, k, v):
+        if k in BUILTINS:
+            _builtins_version[0] += 1
+        super().__setitem__(k, v)
+
+    def update(self, *args, **kwargs):
+        values = dict(*args, **kwargs)
+        if not BUILTINS.keys().isdisjoint(values):
+            _builtins_version[0] += 1
+        super().update(values)
+
     def find_env(self, k: str):
         if k in self:
             return self
@@ -301,17 +587,68 @@ def is_quoted_string(s: str) -> bool:
     return s.startswith('"') and s.endswith('"')
 
 
+_UNBOUND = object()
+
+
 class Lambda:
-    def __init__(self, params, body, env):
+    def __init__(self, params, body, frame, padding=()):
         self.params = params
         self.body = body
-        self.env = env
+        self.frame = frame
+        self.padding = padding
 
     def __call__(self, *args):
-        def result(*a):
-            return evaluate(self.body, Env(dict(zip(self.params, a)), outer=self.env))
+        if len(args) == len(self.params):
+            return self.body([self.frame, *args, *self.padding])
+        return Callable(self.invoke, arity=len(self.params))(*args)
+
+    def invoke(self, *args):
+        return self.body([self.frame, *args, *self.padding])
 
-        return Callable(result, arity=len(self.params))(*args)
+
+def _assigned_names(obj, names, into_lambdas):
+    if not isinstance(obj, list) or not obj or obj[0] == 'quote':
+        return names
+    if obj[0] != 'begin' and len(obj) >= 2:
+        if obj[1] == ':=' and isinstance(obj[0], str):
+            names.add(obj[0])
+        elif obj[1] == '->' and not into_lambdas:
+            return names
+    for item in obj:
+        _assigned_names(item, names, into_lambdas)
+    return names
+
+
+class Scope:
+    def __init__(self, env, assigned, outer=None, params=(), local_names=()):
+        self.env = env
+        self.assigned = assigned
+        self.outer = outer
+        self.params = set(params)
+        self.slots = {name: i for i, name in enumerate(params, 1)}
+        self.size = len(params)
+        for name in local_names:
+            if name not in self.slots:
+                self.size += 1
+                self.slots[name] = self.size
+
+    @staticmethod
+    def root(env, tree):
+        return Scope(env, _assigned_names(tree, set(), into_lambdas=True))
+
+    def nested(self, params, body):
+        return Scope(self.env, self.assigned, self, params, _assigned_names(body, set(), into_lambdas=False))
+
+    def resolve(self, name) -> tuple[list[tuple[int, int]], bool]:
+        addresses = []
+        scope, depth = self, 0
+        while scope.outer is not None:
+            if name in scope.slots:
+                addresses.append((depth, scope.slots[name]))
+                if name in scope.params:
+                    return addresses, True
+            scope, depth = scope.outer, depth + 1
+        return addresses, False
 
 
 def get_delimited(symbol, args):
@@ -321,54 +658,197 @@ def get_delimited(symbol, args):
         return None
 
 
-def evaluate(obj, env):
-    if isinstance(obj, list):
-        if len(obj) >= 1:
-            if obj[0] == 'quote':
-                return obj[1]
-            if obj[0] == 'begin':
-                res = None
-                for e in obj[1:]:
-                    res = evaluate(e, env)
-                return res
-        if len(obj) >= 2:
-            if obj[1] == '..':
-                return list(range(evaluate(obj[0], env), 1 + evaluate(obj[2], env)))
-            if obj[1] == ':=':
-                name, value = obj[0], obj[2]
-                env[name] = evaluate(value, env)
-                return env[name]
-            if obj[1] == '->':
-                return Lambda(params=obj[0], body=obj[2], env=env)
-            if obj[0] == 'if':
-                return evaluate(obj[2] if evaluate(obj[1], env) else obj[3], env)
-            if (items := get_delimited('>>', obj)) is not None:
-                return Pipe(*(evaluate(it, env) for it in items))
-            if (items := get_delimited('|>', obj)) is not None:
-                res, *funcs = items
-                return Pipe(*(evaluate(f, env) for f in funcs))(evaluate(res, env));
-            if obj[0] == '|' and obj[-1] == '|':
-                args = obj[1:-1]
-                return [evaluate(o, env) for o in args]
-            if obj[0] == '{' and obj[-1] == '}':
-                args = obj[1:-1]
-                return {evaluate(args[2 * i], env): evaluate(args[2 * i + 1], env) for i in range(len(args) // 2)}
+def _missing():
+    def result(frame):
+        raise IndexError('list index out of range')
 
+    return result
+
+
+def _compile_item(obj, index, scope):
+    return compile_expr(obj[index], scope) if index < len(obj) else _missing()
+
+
+def _read_slot(depth, slot):
+    if depth == 0:
+        return lambda frame: frame[slot]
+    if depth == 1:
+        return lambda frame: frame[0][slot]
+    if depth == 2:
+        return lambda frame: frame[0][0][slot]
+
+    def result(frame):
+        for _ in range(depth):
+            frame = frame[0]
+        return frame[slot]
+
+    return result
+
+
+def _compile_global(name, scope):
+    env = scope.env
+    if name in BUILTINS and name not in scope.assigned:
+        value = BUILTINS[name]
         try:
-            func, *args = obj
-            proc = evaluate(func, env)
-            params = [evaluate(arg, env) for arg in args]
-            return proc(*params)
-        except Exception as ex:
-            raise RuntimeError(f'Error on evaulation of {func}: {ex}')
+            unchanged = env.find_var(name) is value
+        except RuntimeError:
+            unchanged = False
+        if unchanged:
+            version = _builtins_version[0]
+            return lambda frame: value if _builtins_version[0] == version else env.find_var(name)
+    return lambda frame: env.find_var(name)
+
+
+def _compile_symbol(name, scope):
+    addresses, bound = scope.resolve(name)
+    if bound and len(addresses) == 1:
+        return _read_slot(*addresses[0])
+
+    readers = [_read_slot(depth, slot) for depth, slot in addresses]
+    fallback = readers.pop() if bound else _compile_global(name, scope)
+    if not readers:
+        return fallback
+
+    def result(frame):
+        for read in readers:
+            value = read(frame)
+            if value is not _UNBOUND:
+                return value
+        return fallback(frame)
+
+    return result
+
+
+def _compile_assignment(name, value, scope):
+    if scope.outer is None:
+        env = scope.env
+
+        def result(frame):
+            env[name] = value(frame)
+            return env[name]
+
+        return result
 
+    slot = scope.slots[name]
+
+    def result(frame):
+        res = frame[slot] = value(frame)
+        return res
+
+    return result
+
+
+def _compile_lambda(params, body_obj, scope):
+    inner = scope.nested(params, body_obj)
+    body = compile_expr(body_obj, inner)
+    padding = (_UNBOUND,) * (inner.size - len(params))
+    return lambda frame: Lambda(params=params, body=body, frame=frame, padding=padding)
+
+
+def _compile_application(obj, scope):
+    if not obj:
+        def result(frame):
+            raise RuntimeError('Cannot evaluate an empty list')
+
+        return result
+
+    func_obj, *args_obj = obj
+    func = compile_expr(func_obj, scope)
+    args = [compile_expr(arg, scope) for arg in args_obj]
+    message = f'Error on evaulation of {func_obj}: '
+
+    if len(args) == 1:
+        arg, = args
+
+        def result(frame):
+            try:
+                return func(frame)(arg(frame))
+            except Exception as ex:
+                raise RuntimeError(message + str(ex))
+    elif len(args) == 2:
+        lhs, rhs = args
+
+        def result(frame):
+            try:
+                proc = func(frame)
+                return proc(lhs(frame), rhs(frame))
+            except Exception as ex:
+                raise RuntimeError(message + str(ex))
+    else:
+        def result(frame):
+            try:
+                proc = func(frame)
+                return proc(*[arg(frame) for arg in args])
+            except Exception as ex:
+                raise RuntimeError(message + str(ex))
+
+    return result
+
+
+def _compile_list(obj, scope):
+    if len(obj) >= 1:
+        if obj[0] == 'quote':
+            if len(obj) < 2:
+                return _missing()
+            value = obj[1]
+            return lambda frame: value
+        if obj[0] == 'begin':
+            body = [compile_expr(e, scope) for e in obj[1:]]
+
+            def result(frame):
+                res = None
+                for e in body:
+                    res = e(frame)
+                return res
+
+            return result
+    if len(obj) >= 2:
+        if obj[1] == '..':
+            lower, upper = compile_expr(obj[0], scope), _compile_item(obj, 2, scope)
+            return lambda frame: list(range(lower(frame), 1 + upper(frame)))
+        if obj[1] == ':=':
+            return _compile_assignment(obj[0], _compile_item(obj, 2, scope), scope)
+        if obj[1] == '->':
+            if len(obj) < 3:
+                return _missing()
+            return _compile_lambda(obj[0], obj[2], scope)
+        if obj[0] == 'if':
+            cond = compile_expr(obj[1], scope)
+            then, otherwise = _compile_item(obj, 2, scope), _compile_item(obj, 3, scope)
+            return lambda frame: then(frame) if cond(frame) else otherwise(frame)
+        if (items := get_delimited('>>', obj)) is not None:
+            funcs = [compile_expr(it, scope) for it in items]
+            return lambda frame: Pipe(*(f(frame) for f in funcs))
+        if (items := get_delimited('|>', obj)) is not None:
+            res, *funcs = [compile_expr(it, scope) for it in items]
+            return lambda frame: Pipe(*(f(frame) for f in funcs))(res(frame))
+        if obj[0] == '|' and obj[-1] == '|':
+            args = [compile_expr(o, scope) for o in obj[1:-1]]
+            return lambda frame: [arg(frame) for arg in args]
+        if obj[0] == '{' and obj[-1] == '}':
+            args = obj[1:-1]
+            pairs = [(compile_expr(args[2 * i], scope), compile_expr(args[2 * i + 1], scope))
+                     for i in range(len(args) // 2)]
+            return lambda frame: {key(frame): value(frame) for key, value in pairs}
+
+    return _compile_application(obj, scope)
+
+
+def compile_expr(obj, scope: Scope):
+    if isinstance(obj, list):
+        return _compile_list(obj, scope)
     elif isinstance(obj, str):
         if is_quoted_string(obj):
-            return obj[1:-1]
+            value = obj[1:-1]
+            return lambda frame: value
         else:
-            return env.find_var(obj)
+            return _compile_symbol(obj, scope)
     else:
-        return obj
+        return lambda frame: obj
+
+
+def evaluate(obj, env):
+    return compile_expr(obj, Scope.root(env, obj))(None)
 
 
 def for_each(func, seq):
@@ -384,7 +864,7 @@ class Ap:
         return [f(arg) for f in self.funcs]
 
 
-env = Env({
+BUILTINS = types.MappingProxyType({
     '+': Callable(operator.add, arity=2),
     '-': Callable(operator.sub, arity=2),
     '*': Callable(operator.mul, arity=2),
@@ -433,6 +913,8 @@ env = Env({
     'ap': Ap,
 })
 
+env = Env(BUILTINS)
+
 
 def display(obj, indent=0):
     tab = '  ' * indent
@@ -452,28 +934,29 @@ Literal = Repeat(Char(lambda ch: not (ch in "[]" or ch.isspace()))).alias('Liter
 Sign = Char(lambda c: c in ('+', '-'))
 Digit = Char(str.isdigit)
 
-FloatingPoint = Seq(Optional(Sign),
-                    Repeat(Digit),
+SignedDigits = Seq(Optional(Sign),
+                   Repeat(Digit)).alias('SignedDigits')
+Digits = Repeat(Digit).alias('Digits')
+
+FloatingPoint = Seq(SignedDigits,
                     Char('.'),
-                    Repeat(Digit)).alias('FloatingPoint')
+                    Digits).alias('FloatingPoint')
 
-Integer = Seq(Optional(Sign),
-              Repeat(Digit)).alias('Integer')
+Integer = SignedDigits.alias('Integer')
 
 OpeningBracket = Char('[').alias('OpeningBracket')
 ClosingBracket = Char(']').alias('ClosingBracket')
 
 
+Tokens = Any(Whitespace, OpeningBracket, ClosingBracket, FloatingPoint, Integer, QuotedString(), Literal)
+
+CompiledTokens = Tokens.compile()
+
+
 def tokenize(text: Stream) -> typing.Iterable[Token]:
-    parsers = Any(Whitespace, OpeningBracket, ClosingBracket, FloatingPoint, Integer, QuotedString(), Literal)
-    while text:
-        res = parsers.parse(text)
-        if res is None:
-            break
-        else:
-            text = res.remainder
-            if res.parser is not Whitespace:
-                yield res.token
+    for parser, token in CompiledTokens.scan(text):
+        if parser is not Whitespace:
+            yield token
 
 
 def read_tokens(tokens: typing.Iterable[Token]):
@@ -505,7 +988,8 @@ def load(path):
     return read_tokens(tokenize(load_file(path)))[0]
 
 
-tree = load('code.lisp')
+if __name__ == '__main__':
+    tree = load('code.lisp')
 
-# display(tree)
-print(evaluate(tree, env))
+    # display(tree)
+    print(evaluate(tree, env))
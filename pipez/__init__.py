@@ -1,4 +1,46 @@
-from pipez.seq import seq
-from pipez.opt import opt
-from pipez.tap import tap
+import os
+import sys
 
+_EXPORTS = {
+    'seq': 'pipez.seq',
+    'opt': 'pipez.opt',
+    'tap': 'pipez.tap',
+    'agg': 'pipez.agg',
+    'Profiler': 'pipez.instrument',
+    'enable_from_environment': 'pipez.instrument',
+}
+
+__all__ = list(_EXPORTS)
+
+_ModuleType = type(sys)
+
+
+class _Package(_ModuleType):
+    def __setattr__(self, name, value):
+        # importing e.g. pipez.seq binds the submodule here; keep exporting the seq class instead
+        if name in _EXPORTS and isinstance(value, _ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    __import__(module)
+    value = getattr(sys.modules[module], name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+sys.modules[__name__].__class__ = _Package
+
+if os.environ.get('PIPEZ_PROFILE'):
+    from pipez.instrument import enable_from_environment
+
+    enable_from_environment()
@@ -0,0 +1,121 @@
+import copy
+import functools
+import operator
+
+from pipez.fmt import fmt
+from pipez.functions import to_unary, identity
+from pipez.pipe import Pipeable
+
+_EMPTY = object()
+
+
+class Reducer(Pipeable):
+    __slots__ = ('_name', '_init', '_step', '_result', '_factory')
+
+    def __init__(self, name, init, step, result=identity, factory=None):
+        self._name = name
+        self._init = init
+        self._step = step
+        self._result = result
+        self._factory = factory
+
+    def start(self):
+        return self._init if self._factory is None else self._factory()
+
+    def step(self, state, item):
+        return self._step(state, item)
+
+    def result(self, state):
+        return self._result(state)
+
+    def __call__(self, iterable):
+        state = self.start()
+        step = self._step
+        for item in iterable:
+            state = step(state, item)
+        return self._result(state)
+
+    def __str__(self):
+        return self._name
+
+
+def _non_empty(name):
+    def result(state):
+        if state is _EMPTY:
+            raise ValueError(f'{name}() arg is an empty sequence')
+        return state[1]
+
+    return result
+
+
+def _extreme(name, better, key):
+    key = to_unary(key)
+
+    def step(state, item):
+        k = key(item)
+        return (k, item) if state is _EMPTY or better(k, state[0]) else state
+
+    return Reducer(name, _EMPTY, step, _non_empty(name))
+
+
+def _mean(state):
+    total, count = state
+    if count == 0:
+        raise ValueError('mean() arg is an empty sequence')
+    return total / count
+
+
+# noinspection PyPep8Naming
+class agg:
+    @staticmethod
+    def count():
+        return Reducer('count', 0, lambda state, _: state + 1)
+
+    @staticmethod
+    def sum():
+        return Reducer('sum', 0, operator.add)
+
+    @staticmethod
+    def min(key=None):
+        return _extreme('min', operator.lt, key)
+
+    @staticmethod
+    def max(key=None):
+        return _extreme('max', operator.gt, key)
+
+    @staticmethod
+    def mean():
+        return Reducer('mean', (0, 0), lambda state, item: (state[0] + item, state[1] + 1), _mean)
+
+    @staticmethod
+    def first():
+        return Reducer('first', _EMPTY, lambda state, item: item if state is _EMPTY else state,
+                       lambda state: None if state is _EMPTY else state)
+
+    @staticmethod
+    def last():
+        return Reducer('last', None, lambda _, item: item)
+
+    @staticmethod
+    def fold(func, init=None, factory=None):
+        # every run, e.g. every group_by key, starts from its own copy so that mutable accumulators are not shared
+        factory = factory if factory is not None else functools.partial(copy.copy, init)
+        return Reducer(f'fold({fmt(func)})', init, func, factory=factory)
+
+    @staticmethod
+    def combine(**reducers):
+        names = tuple(reducers)
+        steps = tuple(r.step for r in reducers.values())
+        results = tuple(r.result for r in reducers.values())
+
+        def step(state, item):
+            return tuple([f(s, item) for f, s in zip(steps, state)])
+
+        def result(state):
+            return {name: f(s) for name, f, s in zip(names, results, state)}
+
+        return Reducer('combine(' + ', '.join(f'{k}={fmt(v)}' for k, v in reducers.items()) + ')',
+                       None,
+                       step,
+                       result,
+                       factory=lambda: tuple(r.start() for r in reducers.values()))
@@ -1,3 +1,8 @@
+import operator
+import types
+import weakref
+
+
 def do_nothing(*_, **__):
     pass
 
@@ -6,10 +11,107 @@ def identity(arg):
     return arg
 
 
-def to_unary(func):
+_UNARY_TYPES = (operator.itemgetter, operator.attrgetter, operator.methodcaller)
+
+_MODULE_FUNCTIONS = {
+    func: 1 for func in (
+        abs, all, any, ascii, bin, bool, callable, chr, dict, float, frozenset, hash, hex, id, int, iter, len, list,
+        max, min, next, oct, ord, repr, reversed, set, sorted, str, sum, tuple,
+        operator.abs, operator.index, operator.inv, operator.invert, operator.length_hint, operator.neg,
+        operator.not_, operator.pos, operator.truth,
+    )
+}
+_MODULE_FUNCTIONS.update({
+    func: 2 for func in (pow, compile)
+})
+_MODULE_FUNCTIONS.update({
+    func: 0 for func in (
+        operator.add, operator.sub, operator.mul, operator.truediv, operator.floordiv, operator.mod,
+        operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge,
+        operator.and_, operator.or_, operator.xor, operator.contains, operator.getitem, operator.concat,
+        operator.is_, operator.is_not,
+    )
+})
+_ARG_COUNTS = weakref.WeakKeyDictionary()
+_CALLABLE_TYPES = weakref.WeakKeyDictionary()
+_ADAPTERS = weakref.WeakValueDictionary()
+
+
+def _count_from_code(func, skip=0):
+    code = func.__code__
+    defaults = func.__defaults__ or ()
+    return max(0, code.co_argcount - len(defaults) - max(code.co_posonlyargcount, skip))
+
+
+def _count_from_signature(func):
     import inspect
     from inspect import Parameter
 
+    def is_valid(p):
+        return p.kind in (Parameter.POSITIONAL_OR_KEYWORD,) and p.default is p.empty
+
+    try:
+        return sum(1 for p in inspect.signature(func).parameters.values() if is_valid(p))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _is_plain(func):
+    return not hasattr(func, '__wrapped__') and not hasattr(func, '__signature__')
+
+
+def _arg_count(func):
+    if isinstance(func, types.FunctionType) and _is_plain(func):
+        return _count_from_code(func)
+
+    if isinstance(func, types.MethodType) and isinstance(func.__func__, types.FunctionType) and _is_plain(func):
+        return _count_from_code(func.__func__, skip=1)
+
+    if isinstance(func, _UNARY_TYPES):
+        return 1
+
+    try:
+        return _MODULE_FUNCTIONS[func]
+    except (KeyError, TypeError):
+        pass
+
+    if isinstance(func, types.BuiltinFunctionType) and isinstance(func.__self__, (types.ModuleType, type(None))):
+        res = _MODULE_FUNCTIONS[func] = _count_from_signature(func)
+        return res
+
+    if _is_plain(func):
+        kind = type(func)
+        try:
+            return _CALLABLE_TYPES[kind]
+        except KeyError:
+            call = getattr(kind, '__call__', None)
+            if isinstance(call, types.FunctionType) and not isinstance(func, type) and _is_plain(call):
+                res = _CALLABLE_TYPES[kind] = _count_from_code(call, skip=1)
+                return res
+
+    try:
+        return _ARG_COUNTS[func]
+    except KeyError:
+        res = _ARG_COUNTS[func] = _count_from_signature(func)
+        return res
+    except TypeError:
+        return _count_from_signature(func)
+
+
+def _spread(func):
+    adapter = _ADAPTERS.get(id(func))
+    if adapter is not None and adapter.func is func:
+        return adapter
+
+    def adapter(arg):
+        return func(*arg)
+
+    adapter.func = func
+    _ADAPTERS[id(func)] = adapter
+    return adapter
+
+
+def to_unary(func):
     if func is None:
         return identity
 
@@ -19,18 +121,7 @@ def to_unary(func):
 
         return result
 
-    def is_valid(p):
-        return p.kind in (Parameter.POSITIONAL_OR_KEYWORD,) and p.default is p.empty
-
-    try:
-        arg_count = sum(1 for p in inspect.signature(func).parameters.values() if is_valid(p))
-        if arg_count > 1:
-            def result(arg):
-                return func(*arg)
-
-            return result
-        else:
-            return func
-
-    except (TypeError, ValueError):
+    if _arg_count(func) > 1:
+        return _spread(func)
+    else:
         return func
@@ -0,0 +1,205 @@
+import atexit
+import os
+import sys
+import time
+
+from pipez.pipe import Pipeable, Pipeline
+
+ENVIRONMENT_VARIABLE = 'PIPEZ_PROFILE'
+
+_active = None
+
+
+class StageStats:
+    __slots__ = ('name', 'calls', 'items_in', 'items_out', 'wall_time', 'self_time', 'cpu_time', 'allocated')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.items_in = 0
+        self.items_out = 0
+        self.wall_time = 0.0
+        self.self_time = 0.0
+        self.cpu_time = 0.0
+        self.allocated = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f'StageStats({", ".join(f"{k}={v!r}" for k, v in self.as_dict().items())})'
+
+
+class _Probe:
+    __slots__ = ('_it', '_stats', '_profiler', '_start', 'consumer')
+
+    def __init__(self, it, stats, profiler):
+        self._it = it
+        self._stats = stats
+        self._profiler = profiler
+        self._start = None
+        self.consumer = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        profiler = self._profiler
+        measurement = profiler._start_measurement()
+        if self._start is None:
+            self._start = measurement[0]
+        try:
+            item = next(self._it)
+        except StopIteration:
+            profiler._add_event(self._stats.name, self._start, time.perf_counter(), items=self._stats.items_out)
+            raise
+        finally:
+            profiler._end_measurement(self._stats, measurement)
+        self._stats.items_out += 1
+        if self.consumer is not None:
+            self.consumer.items_in += 1
+        return item
+
+
+def _is_iterator(obj):
+    return hasattr(obj, '__next__') and hasattr(obj, '__iter__') and not isinstance(obj, _Probe)
+
+
+def _profiled_pipeline_call(self, arg):
+    for p in self._pipes:
+        arg = _active._run_stage(p, arg)
+    return arg
+
+
+def _profiled_rrshift(self, other):
+    if isinstance(self, Pipeline):
+        return self(other)
+    return _active._run_stage(self, other)
+
+
+class Profiler:
+    def __init__(self, trace_malloc=False):
+        self.trace_malloc = trace_malloc
+        self.stats = {}
+        self.events = []
+        self._origin = None
+        self._patched = None
+        self._active = []
+
+    def __enter__(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError('Another profiler is already active')
+        if self.trace_malloc:
+            import tracemalloc
+            tracemalloc.start()
+        self._origin = time.perf_counter()
+        self._patched = Pipeline.__call__, Pipeable.__rrshift__
+        Pipeline.__call__ = _profiled_pipeline_call
+        Pipeable.__rrshift__ = _profiled_rrshift
+        _active = self
+        return self
+
+    def __exit__(self, *_):
+        global _active
+        Pipeline.__call__, Pipeable.__rrshift__ = self._patched
+        _active = None
+        if self.trace_malloc:
+            import tracemalloc
+            tracemalloc.stop()
+
+    def _stats_for(self, stage):
+        name = str(stage)
+        try:
+            return self.stats[name]
+        except KeyError:
+            res = self.stats[name] = StageStats(name)
+            return res
+
+    def _start_measurement(self):
+        if self.trace_malloc:
+            import tracemalloc
+            memory = tracemalloc.get_traced_memory()[0]
+        else:
+            memory = 0
+        # the last item collects the time spent in measurements nested inside this one, e.g. pulling
+        # items from an upstream lazy stage, so that it can be excluded from this stage's self time
+        measurement = [time.perf_counter(), time.process_time(), memory, 0.0]
+        self._active.append(measurement)
+        return measurement
+
+    def _end_measurement(self, stats, measurement):
+        wall, cpu, memory, nested = measurement
+        elapsed = time.perf_counter() - wall
+        self._active.pop()
+        if self._active:
+            self._active[-1][3] += elapsed
+        stats.wall_time += elapsed
+        stats.self_time += elapsed - nested
+        stats.cpu_time += time.process_time() - cpu
+        if self.trace_malloc:
+            import tracemalloc
+            stats.allocated += max(0, tracemalloc.get_traced_memory()[0] - memory)
+
+    def _add_event(self, name, start, end, **args):
+        self.events.append({
+            'name': name,
+            'ph': 'X',
+            'ts': (start - self._origin) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': os.getpid(),
+            'tid': 0,
+            'args': args,
+        })
+
+    def _run_stage(self, stage, arg):
+        stats = self._stats_for(stage)
+        stats.calls += 1
+        if isinstance(arg, _Probe):
+            arg.consumer = stats
+        measurement = self._start_measurement()
+        try:
+            res = stage(arg)
+        finally:
+            self._end_measurement(stats, measurement)
+        self._add_event(stats.name, measurement[0], time.perf_counter())
+        if _is_iterator(res):
+            res = _Probe(res, stats, self)
+        return res
+
+    def table(self):
+        header = ('stage', 'calls', 'items in', 'items out', 'self [s]', 'total [s]', 'cpu [s]', 'allocated [B]')
+        rows = [(s.name, str(s.calls), str(s.items_in), str(s.items_out),
+                 f'{s.self_time:.6f}', f'{s.wall_time:.6f}', f'{s.cpu_time:.6f}', str(s.allocated))
+                for s in sorted(self.stats.values(), key=lambda s: s.self_time, reverse=True)]
+        widths = [max(len(row[i]) for row in (header, *rows)) for i in range(len(header))]
+        lines = ['  '.join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths)))
+                 for row in (header, *rows)]
+        lines.insert(1, '  '.join('-' * w for w in widths))
+        return '\n'.join(lines)
+
+    def chrome_trace(self):
+        return {'traceEvents': self.events, 'displayTimeUnit': 'ms'}
+
+    def to_chrome_trace(self, path):
+        import json
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.chrome_trace(), file)
+
+
+def enable_from_environment():
+    value = os.environ.get(ENVIRONMENT_VARIABLE)
+    if not value or _active is not None:
+        return None
+
+    profiler = Profiler().__enter__()
+
+    def report():
+        profiler.__exit__(None, None, None)
+        if value.endswith('.json'):
+            profiler.to_chrome_trace(value)
+        else:
+            print(profiler.table(), file=sys.stderr)
+
+    atexit.register(report)
+    return profiler
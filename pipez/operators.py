@@ -1,6 +1,7 @@
 import operator
 
 from pipez.fmt import fmt
+from pipez.functions import to_unary
 from pipez.pipe import as_pipeable, Pipeable, Function
 
 add = as_pipeable(operator.add)
@@ -15,6 +16,8 @@ neg = Function(operator.neg)
 
 # noinspection PyPep8Naming
 class combine(Pipeable):
+    __slots__ = ('all_funcs', '_func', '__name__')
+
     def __init__(self, func, *funcs):
         if funcs:
             self.all_funcs = (func,) + funcs
@@ -32,12 +35,18 @@ class combine(Pipeable):
     def __call__(self, item):
         return self._func(item)
 
+    def over_batch(self, rows):
+        rows = rows if isinstance(rows, (list, tuple)) else list(rows)
+        return tuple(list(map(_column_getter(f), rows)) for f in self.all_funcs)
+
     def __repr__(self):
         return self.__name__
 
 
 # noinspection PyPep8Naming
 class get_attr(Pipeable):
+    __slots__ = ('_func',)
+
     def __init__(self, path):
         self._func = operator.attrgetter(path)
 
@@ -50,6 +59,8 @@ class get_attr(Pipeable):
 
 # noinspection PyPep8Naming
 class get_item(Pipeable):
+    __slots__ = ('_func',)
+
     def __init__(self, path):
         self._func = operator.itemgetter(path)
 
@@ -64,3 +75,9 @@ get_first = Function(operator.itemgetter(0))
 get_second = Function(operator.itemgetter(1))
 get_key = get_first
 get_value = get_second
+
+
+def _column_getter(func):
+    if isinstance(func, (get_attr, get_item)):
+        return func._func
+    return to_unary(func)
@@ -1,4 +1,5 @@
 import functools
+import time
 
 from pipez.fmt import fmt
 from pipez.functions import to_unary
@@ -9,7 +10,79 @@ def _flatten(args, getter):
         yield from getter(a)
 
 
+_FUSIBLE = {}
+
+_REWRITE_RULES = []
+
+_FUSED_STATEMENTS = {
+    'map': 'item = f{index}(item)',
+    'filter': 'if not f{index}(item):\n            continue',
+    'take_while': 'if not f{index}(item):\n            return',
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _fused_loop(kinds):
+    params = ''.join(f', f{index}' for index in range(len(kinds)))
+    body = ''.join(f'        {_FUSED_STATEMENTS[kind].format(index=index)}\n' for index, kind in enumerate(kinds))
+    source = f'def fused(iterable{params}):\n    for item in iterable:\n{body}        yield item\n'
+    namespace = {}
+    exec(source, namespace)
+    return namespace['fused']
+
+
+def _fusible_ops(p):
+    if isinstance(p, Fused):
+        return p._ops
+    if isinstance(p, Function) and len(p._args) == 1 and not p._kwargs and p._func in _FUSIBLE:
+        return (_FUSIBLE[p._func], to_unary(p._args[0])),
+    return None
+
+
+def rewrite_rule(rule):
+    _REWRITE_RULES.append(rule)
+    return rule
+
+
+def _rewrite(pipes):
+    result = []
+    for p in pipes:
+        result.append(p)
+        while len(result) > 1:
+            for rule in _REWRITE_RULES:
+                if (replacement := rule(result[-2], result[-1])) is not None:
+                    del result[-2:]
+                    result.extend(replacement)
+                    break
+            else:
+                break
+    return tuple(result)
+
+
+def _fuse(pipes):
+    result = []
+    run = []
+
+    def flush():
+        if len(run) > 1:
+            result.append(Fused(*run))
+        else:
+            result.extend(run)
+        run.clear()
+
+    for p in pipes:
+        if _fusible_ops(p) is not None:
+            run.append(p)
+        else:
+            flush()
+            result.append(p)
+    flush()
+    return tuple(result)
+
+
 class Pipeable:
+    __slots__ = ()
+
     def __rshift__(self, other):
         return Pipeline(self, other)
 
@@ -30,8 +103,14 @@ class Pipeable:
 
 
 class Pipeline(Pipeable):
+    __slots__ = ('_pipes',)
+
+    auto_compile = False
+
     def __init__(self, *pipes):
-        self._pipes = tuple(_flatten(pipes, lambda p: p._pipes if isinstance(p, Pipeline) else (to_unary(p),)))
+        self._pipes = _rewrite(_flatten(pipes, lambda p: p._pipes if isinstance(p, Pipeline) else (to_unary(p),)))
+        if self.auto_compile:
+            self._pipes = _fuse(self._pipes)
 
     def __call__(self, arg):
         for p in self._pipes:
@@ -39,33 +118,128 @@ class Pipeline(Pipeable):
 
         return arg
 
+    def compile(self):
+        return Pipeline(*_fuse(self._pipes))
+
     def __str__(self):
         return 'pipeline(' + ', '.join(fmt(p) for p in self._pipes) + ')'
 
 
+class Fused(Pipeable):
+    __slots__ = ('_stages', '_ops', '_loop', '_funcs')
+
+    def __init__(self, *stages):
+        self._stages = tuple(_flatten(stages, lambda p: p._stages if isinstance(p, Fused) else (p,)))
+        self._ops = tuple(_flatten(self._stages, _fusible_ops))
+        self._loop = _fused_loop(tuple(kind for kind, _ in self._ops))
+        self._funcs = tuple(func for _, func in self._ops)
+
+    def __call__(self, iterable):
+        return self._loop(iter(iterable), *self._funcs)
+
+    def __str__(self):
+        return 'fused(' + ', '.join(str(p) for p in self._stages) + ')'
+
+
 class All(Pipeable):
+    __slots__ = ('_preds',)
+
     def __init__(self, *preds):
         self._preds = tuple(_flatten(preds, lambda p: p._preds if isinstance(p, All) else (to_unary(p),)))
 
     def __call__(self, arg):
         return all(p(arg) for p in self._preds)
 
+    def adaptive(self, sample_every=16, reorder_every=1024):
+        return AdaptiveAll(*self._preds, sample_every=sample_every, reorder_every=reorder_every)
+
     def __str__(self):
         return 'all(' + ', '.join(fmt(p) for p in self._preds) + ')'
 
 
 class Any(Pipeable):
+    __slots__ = ('_preds',)
+
     def __init__(self, *preds):
         self._preds = tuple(_flatten(preds, lambda p: p._preds if isinstance(p, Any) else (to_unary(p),)))
 
     def __call__(self, arg):
         return any(p(arg) for p in self._preds)
 
+    def adaptive(self, sample_every=16, reorder_every=1024):
+        return AdaptiveAny(*self._preds, sample_every=sample_every, reorder_every=reorder_every)
+
     def __str__(self):
         return 'any(' + ', '.join(fmt(p) for p in self._preds) + ')'
 
 
+class _Adaptive:
+    _short_circuit_on = None
+
+    def _init_adaptive(self, sample_every, reorder_every):
+        self._sample_every = sample_every
+        self._reorder_every = reorder_every
+        self._calls = 0
+        self._stats = {id(p): [0, 0, 0.0] for p in self._preds}
+
+    def __call__(self, arg):
+        self._calls += 1
+        if self._calls % self._reorder_every == 0:
+            self._reorder()
+        if self._calls % self._sample_every:
+            return super().__call__(arg)
+        return self._sample(arg)
+
+    def _sample(self, arg):
+        # short-circuits like the plain call, so only the predicates that ran are measured
+        for p in self._preds:
+            stats = self._stats[id(p)]
+            start = time.perf_counter()
+            res = bool(p(arg))
+            stats[2] += time.perf_counter() - start
+            stats[0] += 1
+            stats[1] += res
+            if res == self._short_circuit_on:
+                return res
+        return not self._short_circuit_on
+
+    def _rank(self, p):
+        evaluations, passed, elapsed = self._stats[id(p)]
+        if not evaluations:
+            return 0.0
+        short_circuits = passed if self._short_circuit_on else evaluations - passed
+        return (elapsed / evaluations) / max(short_circuits / evaluations, 1e-9)
+
+    def _reorder(self):
+        # predicates may be moved in front of each other, so one must not guard another
+        # (as in `x is not None` followed by `x > 3`)
+        self._preds = tuple(sorted(self._preds, key=self._rank))
+        # halving keeps the ratios, so predicates that sampling no longer reaches keep their rank
+        for stats in self._stats.values():
+            stats[0] /= 2
+            stats[1] /= 2
+            stats[2] /= 2
+
+
+class AdaptiveAll(_Adaptive, All):
+    _short_circuit_on = False
+
+    def __init__(self, *preds, sample_every=16, reorder_every=1024):
+        super().__init__(*preds)
+        self._init_adaptive(sample_every, reorder_every)
+
+
+class AdaptiveAny(_Adaptive, Any):
+    _short_circuit_on = True
+
+    def __init__(self, *preds, sample_every=16, reorder_every=1024):
+        super().__init__(*preds)
+        self._init_adaptive(sample_every, reorder_every)
+
+
 class Not(Pipeable):
+    __slots__ = ('_pred',)
+
     def __init__(self, pred):
         self._pred = to_unary(pred)
 
@@ -80,18 +254,29 @@ class Not(Pipeable):
 
 
 class Function(Pipeable):
+    __slots__ = ('_func', '_args', '_kwargs', '_name')
+
     def __init__(self, func, *args, **kwargs):
         self._func = func
         self._args = args
         self._kwargs = kwargs
         self._name = None
 
+    @classmethod
+    def _create(cls, func, args, kwargs, name):
+        self = cls.__new__(cls)
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._name = name
+        return self
+
     def __call__(self, arg):
         return self._func(arg, *self._args, **self._kwargs)
 
     def set_name(self, name):
-        self._name = name
-        return self
+        # parameterless stages are shared instances, so renaming must not mutate this one
+        return Function._create(self._func, self._args, self._kwargs, name)
 
     def __str__(self):
         return (self._name or fmt(self._func)) + \
@@ -101,13 +286,20 @@ class Function(Pipeable):
                + ')'
 
 
-def as_pipeable(func=None, *, name=None):
+def as_pipeable(func=None, *, name=None, fuse=None):
     if func is None:
-        return functools.partial(as_pipeable, name=name)
+        return functools.partial(as_pipeable, name=name, fuse=fuse)
     else:
+        if fuse is not None:
+            _FUSIBLE[func] = fuse
+
+        interned = Function._create(func, (), {}, name)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            return Function(func, *args, **kwargs).set_name(name)
+            if not args and not kwargs:
+                return interned
+            return Function._create(func, args, kwargs, name)
 
         return wrapper
 
@@ -1,7 +1,11 @@
 import builtins
+import collections
+import mmap
 import operator
+import re
 
 from pipez import pipe
+from pipez.fmt import fmt
 from pipez.functions import to_unary
 from pipez.pipe import as_pipeable, Function, Pipeline
 
@@ -14,6 +18,8 @@ ge = as_pipeable(operator.ge)
 
 all_of = pipe.All
 any_of = pipe.Any
+adaptive_all_of = pipe.AdaptiveAll
+adaptive_any_of = pipe.AdaptiveAny
 not_ = pipe.Not
 
 is_none = Function(lambda arg: arg is None)
@@ -44,18 +50,234 @@ def contains(arg, pred):
     return builtins.any(pred(a) for a in arg)
 
 
+_BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+
+def _is_native_affix(arg, affix):
+    if isinstance(arg, str):
+        return isinstance(affix, str)
+    return isinstance(arg, (bytes, bytearray)) and isinstance(affix, _BUFFER_TYPES)
+
+
+def _starts_with(arg, prefix):
+    if _is_native_affix(arg, prefix):
+        return arg.startswith(prefix)
+    if isinstance(arg, mmap.mmap):
+        return arg.find(prefix, 0, len(prefix)) == 0
+    return arg[:len(prefix)] == prefix
+
+
+def _ends_with(arg, suffix):
+    if _is_native_affix(arg, suffix):
+        return arg.endswith(suffix)
+    if isinstance(arg, mmap.mmap):
+        start = len(arg) - len(suffix)
+        return start >= 0 and arg.find(suffix, start) == start
+    if not suffix:
+        return True
+    return arg[-len(suffix):] == suffix
+
+
 @as_pipeable
 def has_prefix(arg, prefix):
-    return arg[:len(prefix)] == prefix
+    return _starts_with(arg, prefix)
 
 
 @as_pipeable
 def has_suffix(arg, suffix):
-    return arg[-len(suffix):] == suffix
+    return _ends_with(arg, suffix)
+
+
+def _each(args, method, affix, check):
+    args = args if isinstance(args, (list, tuple)) else list(args)
+    if isinstance(affix, (str, *_BUFFER_TYPES)):
+        try:
+            return list(builtins.map(operator.methodcaller(method, affix), args))
+        except (AttributeError, TypeError):
+            pass
+    return [check(arg, affix) for arg in args]
+
+
+@as_pipeable
+def each_has_prefix(args, prefix):
+    return _each(args, 'startswith', prefix, _starts_with)
+
+
+@as_pipeable
+def each_has_suffix(args, suffix):
+    return _each(args, 'endswith', suffix, _ends_with)
+
+
+def _byte_format(obj):
+    if isinstance(obj, (bytes, bytearray, mmap.mmap)):
+        return 'B'
+    if isinstance(obj, memoryview) and obj.itemsize == 1 and obj.format in ('B', 'b') and obj.contiguous:
+        return obj.format
+    return None
+
+
+def _find_native(arg, sub):
+    if isinstance(arg, str) and isinstance(sub, str):
+        return sub in arg
+    if (kind := _byte_format(arg)) is not None and _byte_format(sub) == kind:
+        if isinstance(arg, (bytes, bytearray)):
+            return sub in arg
+        if isinstance(arg, mmap.mmap):
+            return arg.find(sub) != -1
+        # re scans any contiguous buffer in place, without copying the memoryview into bytes
+        return re.compile(re.escape(bytes(sub))).search(arg) is not None
+    return None
+
+
+def _kmp_table(sub):
+    table = [0] * len(sub)
+    k = 0
+    for i in range(1, len(sub)):
+        while k > 0 and sub[i] != sub[k]:
+            k = table[k - 1]
+        if sub[i] == sub[k]:
+            k += 1
+        table[i] = k
+    return table
+
+
+def _kmp_search(arg, sub, table):
+    k = 0
+    for item in arg:
+        while k > 0 and item != sub[k]:
+            k = table[k - 1]
+        if item == sub[k]:
+            k += 1
+            if k == len(sub):
+                return True
+    return False
 
 
 @as_pipeable
 def contains_subrange(arg, sub):
-    arg_len = len(arg)
-    sub_len = len(sub)
-    return arg_len >= sub_len and builtins.any(arg[i:i + sub_len] == sub for i in range(0, arg_len - sub_len + 1))
+    if (res := _find_native(arg, sub)) is not None:
+        return res
+    if not sub:
+        return True
+    return _kmp_search(arg, sub, _kmp_table(sub))
+
+
+class _AhoCorasick:
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._match = [False]
+        for pattern in patterns:
+            state = 0
+            for item in pattern:
+                if item not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._match.append(False)
+                    self._goto[state][item] = len(self._goto) - 1
+                state = self._goto[state][item]
+            self._match[state] = True
+
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for item, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and item not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(item, 0)
+                self._match[child] = self._match[child] or self._match[self._fail[child]]
+
+    def search(self, arg):
+        if self._match[0]:
+            return True
+        goto, fail, match = self._goto, self._fail, self._match
+        state = 0
+        for item in arg:
+            while state and item not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(item, 0)
+            if match[state]:
+                return True
+        return False
+
+
+def contains_any_subrange(patterns):
+    patterns = [p.tolist() if isinstance(p, memoryview) else p for p in patterns]
+    return Function(_AhoCorasick(patterns).search).set_name('contains_any_subrange')
+
+
+_COMPARISONS = {
+    operator.eq: '==',
+    operator.ne: '!=',
+    operator.lt: '<',
+    operator.le: '<=',
+    operator.gt: '>',
+    operator.ge: '>=',
+}
+
+
+class _Compiler:
+    def __init__(self):
+        self.namespace = {'bool': bool}
+        self._names = 0
+
+    def _name(self, prefix):
+        self._names += 1
+        return f'_{prefix}{self._names}_'
+
+    def constant(self, value):
+        name = self._name('c')
+        self.namespace[name] = value
+        return name
+
+    def chain(self, stages, arg, as_value):
+        *init, last = stages
+        if not init:
+            return self.expression(last, arg, as_value)
+        temp = self._name('t')
+        res = self.expression(last, temp, as_value)
+        value = self.chain(init, arg, True)
+        if res.count(temp) == 1:
+            return res.replace(temp, value)
+        return res.replace(temp, f'({temp} := {value})', 1)
+
+    def expression(self, pred, arg, as_value):
+        if pred is is_none:
+            return f'({arg} is None)'
+        if pred is always or pred is never:
+            constant = 'True' if pred is always else 'False'
+            # inside a chain arg stands for the earlier stages, which still have to run (and may raise)
+            return constant if arg == 'arg' else f'({arg}, {constant})[1]'
+
+        if isinstance(pred, (pipe.All, pipe.Any)):
+            joiner = ' and ' if isinstance(pred, pipe.All) else ' or '
+            res = '(' + joiner.join(self.expression(p, arg, False) for p in pred._preds) + ')'
+            return f'bool{res}' if as_value else res
+
+        if isinstance(pred, pipe.Not):
+            return f'(not {self.expression(pred._pred, arg, False)})'
+
+        if isinstance(pred, Pipeline):
+            return self.chain(pred._pipes, arg, as_value)
+
+        if isinstance(pred, Function):
+            if pred._func in _COMPARISONS and len(pred._args) == 1 and not pred._kwargs:
+                return f'({arg} {_COMPARISONS[pred._func]} {self.constant(pred._args[0])})'
+            args = [arg] + [self.constant(a) for a in pred._args] + \
+                   [f'{k}={self.constant(v)}' for k, v in pred._kwargs.items()]
+            return f'{self.constant(pred._func)}({", ".join(args)})'
+
+        return f'{self.constant(pred)}({arg})'
+
+
+def compile(pred):
+    pred = to_unary(pred)
+    compiler = _Compiler()
+    source = f'def compiled(arg):\n    return {compiler.expression(pred, "arg", True)}\n'
+    exec(source, compiler.namespace)
+    res = compiler.namespace['compiled']
+    res.__name__ = res.__qualname__ = fmt(pred)
+    res.source = source
+    return res
@@ -1,11 +1,18 @@
 import builtins
+import collections
 import functools
+import heapq
 import itertools
 import operator
+import os
+import time
 
+from pipez.agg import agg, Reducer
 from pipez.functions import to_unary, identity
-from pipez.pipe import as_pipeable, Not
+from pipez.operators import combine
+from pipez.pipe import as_pipeable, rewrite_rule, Function, Not
 from pipez.predicates import is_none
+from pipez.vectorized import Vectorized
 
 
 def _adjust_selectors(key_selector, value_selector):
@@ -15,16 +22,254 @@ def _adjust_selectors(key_selector, value_selector):
         return to_unary(key_selector) or identity, to_unary(value_selector) or identity
 
 
+_EXECUTORS = {
+    'thread': 'ThreadPoolExecutor',
+    'process': 'ProcessPoolExecutor',
+}
+
+
+def _apply_to_chunk(func, chunk):
+    # adapted in the worker: the adapters to_unary creates are local functions that cannot be pickled
+    func = to_unary(func)
+    return [func(item) for item in chunk]
+
+
+def _check_size(name, n):
+    if n < 1:
+        raise ValueError(f'{name} must be at least 1, got {n}')
+
+
+def _check_parallel(workers, chunksize):
+    if workers is not None:
+        _check_size('workers', workers)
+    _check_size('chunksize', chunksize)
+
+
+def _batch_map(iterable, func, size, max_latency):
+    batch = []
+    deadline = None
+    for item in iterable:
+        if not batch and max_latency is not None:
+            deadline = time.monotonic() + max_latency
+        batch.append(item)
+        if len(batch) >= size or (deadline is not None and time.monotonic() >= deadline):
+            yield from func(batch)
+            batch = []
+    if batch:
+        yield from func(batch)
+
+
+def _parallel(iterable, func, workers, executor, ordered, chunksize):
+    import concurrent.futures
+
+    try:
+        executor_type = getattr(concurrent.futures, _EXECUTORS[executor])
+    except KeyError:
+        raise ValueError(f'Unknown executor {executor!r}, expected one of {", ".join(_EXECUTORS)}')
+
+    workers = workers or os.cpu_count() or 1
+    limit = 2 * workers
+    it = iter(iterable)
+    chunks = iter(lambda: list(itertools.islice(it, chunksize)), [])
+
+    pool = executor_type(max_workers=workers)
+    try:
+        if ordered:
+            pending = collections.deque()
+            for chunk in chunks:
+                pending.append((chunk, pool.submit(_apply_to_chunk, func, chunk)))
+                if len(pending) >= limit:
+                    chunk, future = pending.popleft()
+                    yield chunk, future.result()
+            while pending:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        else:
+            pending = {}
+            for chunk in chunks:
+                pending[pool.submit(_apply_to_chunk, func, chunk)] = chunk
+                if len(pending) >= limit:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+            for future in concurrent.futures.as_completed(pending):
+                yield pending[future], future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def _aiter(iterable):
+    if hasattr(iterable, '__aiter__'):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+async def _acall(func, item):
+    res = func(item)
+    if hasattr(res, '__await__'):
+        res = await res
+    return res
+
+
+async def _abounded(iterable, func, concurrency):
+    import asyncio
+
+    func = to_unary(func)
+    pending = collections.deque()
+    try:
+        async for item in _aiter(iterable):
+            pending.append((item, asyncio.ensure_future(_acall(func, item))))
+            if len(pending) >= concurrency:
+                item, task = pending.popleft()
+                yield item, await task
+        while pending:
+            item, task = pending.popleft()
+            yield item, await task
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+def _write_run(items, tmpdir):
+    import pickle
+    import tempfile
+
+    file = tempfile.TemporaryFile(dir=tmpdir)
+    for item in items:
+        pickle.dump(item, file, protocol=pickle.HIGHEST_PROTOCOL)
+    file.seek(0)
+    return file
+
+
+def _read_run(file):
+    import pickle
+
+    while True:
+        try:
+            yield pickle.load(file)
+        except EOFError:
+            return
+
+
+def _external_sort(iterable, key, reverse, max_items_in_memory, tmpdir):
+    runs = []
+    last = []
+    try:
+        for chunk in iterable >> seq.chunk(max_items_in_memory):
+            chunk.sort(key=key, reverse=reverse)
+            # full chunks are spilled right away, only a short final one stays in memory
+            if len(chunk) == max_items_in_memory:
+                runs.append(_write_run(chunk, tmpdir))
+            else:
+                last = chunk
+            del chunk
+        yield from heapq.merge(*(_read_run(file) for file in runs), last, key=key, reverse=reverse)
+    finally:
+        for file in runs:
+            file.close()
+
+
+class _Buffer:
+    def __init__(self, max_items, spill, tmpdir):
+        self._max_items = max_items
+        self._spill = spill
+        self._tmpdir = tmpdir
+        self._memory = collections.deque()
+        self._file = None
+        self._read_pos = 0
+        self._spilled = 0
+
+    def __bool__(self):
+        return bool(self._memory) or self._spilled > 0
+
+    def append(self, item):
+        if not self._spilled and (self._max_items is None or len(self._memory) < self._max_items):
+            self._memory.append(item)
+        elif self._spill:
+            import pickle
+            import tempfile
+
+            if self._file is None:
+                self._file = tempfile.TemporaryFile(dir=self._tmpdir)
+            self._file.seek(0, os.SEEK_END)
+            pickle.dump(item, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+            self._spilled += 1
+        else:
+            raise BufferError(f'Buffer limit of {self._max_items} items exceeded')
+
+    def popleft(self):
+        if self._memory:
+            return self._memory.popleft()
+        import pickle
+
+        self._file.seek(self._read_pos)
+        item = pickle.load(self._file)
+        self._read_pos = self._file.tell()
+        self._spilled -= 1
+        if not self._spilled:
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_pos = 0
+        return item
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _split(iterable, n, route, max_buffer, spill, tmpdir):
+    it = iter(iterable)
+    buffers = [_Buffer(max_buffer, spill, tmpdir) for _ in range(n)]
+
+    def branch(index):
+        own = buffers[index]
+        try:
+            while True:
+                if own:
+                    yield own.popleft()
+                    continue
+                for item in it:
+                    targets = route(item)
+                    for target in targets:
+                        if target != index and buffers[target] is not None:
+                            buffers[target].append(item)
+                    if index in targets:
+                        yield item
+                        break
+                else:
+                    return
+        finally:
+            buffers[index] = None
+            own.close()
+
+    return tuple(branch(index) for index in range(n))
+
+
+def _sort_args(key=None, reverse=False):
+    return key, reverse
+
+
+def _is_stage(p, pipeable):
+    return isinstance(p, Function) and p._func is pipeable.__wrapped__
+
+
 # noinspection PyPep8Naming
 class seq:
     @staticmethod
     @as_pipeable
     def len(iterable):
+        if isinstance(iterable, Vectorized):
+            return len(iterable)
         return sum(1 for _ in iterable)
 
     @staticmethod
-    @as_pipeable
+    @as_pipeable(fuse='map')
     def map(iterable, func):
+        if isinstance(iterable, Vectorized):
+            return iterable.map(func)
         func = to_unary(func)
         return builtins.map(func, iterable)
 
@@ -32,7 +277,16 @@ class seq:
 
     @staticmethod
     @as_pipeable
+    def pmap(iterable, func, workers=None, executor='thread', ordered=True, chunksize=1):
+        _check_parallel(workers, chunksize)
+        return itertools.chain.from_iterable(
+            results for _, results in _parallel(iterable, func, workers, executor, ordered, chunksize))
+
+    @staticmethod
+    @as_pipeable(fuse='filter')
     def take_if(iterable, pred):
+        if isinstance(iterable, Vectorized):
+            return iterable.filter(pred)
         pred = to_unary(pred)
         return builtins.filter(pred, iterable)
 
@@ -44,9 +298,19 @@ class seq:
 
     filter = take_if
 
+    @staticmethod
+    @as_pipeable
+    def pfilter(iterable, pred, workers=None, executor='thread', ordered=True, chunksize=1):
+        _check_parallel(workers, chunksize)
+        return itertools.chain.from_iterable(
+            itertools.compress(chunk, results)
+            for chunk, results in _parallel(iterable, pred, workers, executor, ordered, chunksize))
+
     @staticmethod
     @as_pipeable
     def slice(iterable, start, stop, step=None):
+        if isinstance(iterable, Vectorized):
+            return iterable.slice(start, stop, step)
         return itertools.islice(iterable, start, stop, step)
 
     @staticmethod
@@ -62,7 +326,7 @@ class seq:
         return seq.slice(None, None, n)
 
     @staticmethod
-    @as_pipeable
+    @as_pipeable(fuse='take_while')
     def take_while(iterable, pred):
         pred = to_unary(pred)
         return itertools.takewhile(pred, iterable)
@@ -94,9 +358,30 @@ class seq:
     @staticmethod
     @as_pipeable
     def sort(iterable, key=None, reverse=False):
+        if isinstance(iterable, Vectorized):
+            return iterable.sort(key, reverse)
         key = to_unary(key)
         return builtins.sorted(iterable, key=key, reverse=reverse)
 
+    @staticmethod
+    @as_pipeable
+    def external_sort(iterable, key=None, reverse=False, max_items_in_memory=100_000, tmpdir=None):
+        _check_size('max_items_in_memory', max_items_in_memory)
+        key = to_unary(key) if key is not None else None
+        return _external_sort(iterable, key, reverse, max_items_in_memory, tmpdir)
+
+    @staticmethod
+    @as_pipeable
+    def nsmallest(iterable, n, key=None):
+        key = to_unary(key) if key is not None else None
+        return heapq.nsmallest(n, iterable, key=key)
+
+    @staticmethod
+    @as_pipeable
+    def nlargest(iterable, n, key=None):
+        key = to_unary(key) if key is not None else None
+        return heapq.nlargest(n, iterable, key=key)
+
     @staticmethod
     @as_pipeable
     def zip_with(iterable, other_iterable):
@@ -117,14 +402,52 @@ class seq:
 
     @staticmethod
     @as_pipeable
-    def tee(iterable, n=2):
-        return itertools.tee(iterable, n)
+    def chunk(iterable, n):
+        _check_size('n', n)
+        it = iter(iterable)
+        return iter(lambda: list(itertools.islice(it, n)), [])
+
+    @staticmethod
+    @as_pipeable
+    def columns(iterable, *funcs, as_arrays=False):
+        res = combine(*funcs).over_batch(iterable)
+        return tuple(Vectorized(column) for column in res) if as_arrays else res
+
+    @staticmethod
+    @as_pipeable
+    def unbatch(iterable):
+        return itertools.chain.from_iterable(iterable)
+
+    @staticmethod
+    @as_pipeable
+    def batch_map(iterable, func, size, max_latency=None):
+        _check_size('size', size)
+        return _batch_map(iterable, func, size, max_latency)
 
     @staticmethod
     @as_pipeable
-    def partition(iterable, pred):
-        s1, s2 = iterable >> seq.tee(2)
-        return s1 >> seq.take_if(pred), s2 >> seq.drop_if(pred)
+    def tee(iterable, n=2, max_buffer=None, spill=False, tmpdir=None):
+        if max_buffer is None:
+            return itertools.tee(iterable, n)
+        every = range(n)
+        return _split(iterable, n, lambda _: every, max_buffer, spill, tmpdir)
+
+    @staticmethod
+    @as_pipeable
+    def partition(iterable, pred, max_buffer=None, spill=False, tmpdir=None):
+        pred = to_unary(pred)
+        true_branch, false_branch = (0,), (1,)
+        return _split(iterable, 2, lambda item: true_branch if pred(item) else false_branch, max_buffer, spill, tmpdir)
+
+    @staticmethod
+    @as_pipeable
+    def partition_into(iterable, pred, sink_true, sink_false):
+        pred, sink_true, sink_false = to_unary(pred), to_unary(sink_true), to_unary(sink_false)
+        for item in iterable:
+            if pred(item):
+                sink_true(item)
+            else:
+                sink_false(item)
 
     @staticmethod
     @as_pipeable
@@ -152,14 +475,17 @@ class seq:
         return _class(iterable)
 
     @staticmethod
+    @functools.cache
     def to_list():
         return seq.to(list)
 
     @staticmethod
+    @functools.cache
     def to_set():
         return seq.to(set)
 
     @staticmethod
+    @functools.cache
     def to_tuple():
         return seq.to(tuple)
 
@@ -178,25 +504,65 @@ class seq:
             res.setdefault(key_selector(item), []).append(value_selector(item))
         return res
 
+    @staticmethod
+    @as_pipeable
+    def group_by(iterable, key, agg):
+        key = to_unary(key)
+        reducer = _as_reducer(agg)
+        step = reducer.step
+        states = {}
+        for item in iterable:
+            k = key(item)
+            states[k] = step(states[k] if k in states else reducer.start(), item)
+        return {k: reducer.result(state) for k, state in states.items()}
+
+    @staticmethod
+    @as_pipeable
+    def group_adjacent(iterable, key, agg=None):
+        key = to_unary(key)
+        reducer = _as_reducer(agg) if agg is not None else seq.to_list()
+        for k, group in itertools.groupby(iterable, key):
+            yield k, reducer(group)
+
+    @staticmethod
+    @as_pipeable
+    def aggregate(iterable, **reducers):
+        return _combine_reducers(**reducers)(iterable)
+
     @staticmethod
     @as_pipeable
     def reduce(iterable, func, init):
         return functools.reduce(func, iterable, init)
 
+    @staticmethod
+    @as_pipeable
+    def vectorize(iterable):
+        return Vectorized.from_iterable(iterable)
+
+    @staticmethod
+    def from_array(array):
+        return Vectorized(array)
+
     @staticmethod
     @as_pipeable
     def sum(iterable):
+        if isinstance(iterable, Vectorized):
+            return iterable.sum()
         return builtins.sum(iterable)
 
     @staticmethod
     @as_pipeable
     def min(iterable, key=None):
+        if isinstance(iterable, Vectorized) and key is None:
+            return iterable.min()
         key = to_unary(key)
         return builtins.min(iterable, key=key)
 
     @staticmethod
     @as_pipeable
     def max(iterable, key=None):
+        if isinstance(iterable, Vectorized) and key is None:
+            return iterable.max()
         key = to_unary(key)
         return builtins.max(iterable, key=key)
 
@@ -217,3 +583,95 @@ class seq:
     @as_pipeable
     def extend(iterable, other_iterable):
         return itertools.chain(iterable, other_iterable)
+
+    @staticmethod
+    @as_pipeable
+    async def amap(iterable, func, concurrency=1):
+        async for _, res in _abounded(iterable, func, concurrency):
+            yield res
+
+    @staticmethod
+    @as_pipeable
+    async def afilter(iterable, pred, concurrency=1):
+        async for item, res in _abounded(iterable, pred, concurrency):
+            if res:
+                yield item
+
+    @staticmethod
+    @as_pipeable
+    async def atake(iterable, n):
+        if n <= 0:
+            return
+        async for item in _aiter(iterable):
+            yield item
+            n -= 1
+            if n <= 0:
+                break
+
+    @staticmethod
+    @as_pipeable
+    async def ato_list(iterable):
+        return [item async for item in _aiter(iterable)]
+
+    @staticmethod
+    @as_pipeable
+    async def afor_each(iterable, func):
+        func = to_unary(func)
+        async for item in _aiter(iterable):
+            await _acall(func, item)
+
+
+def _sorted_prefix(select, iterable, n, key, reverse):
+    if isinstance(iterable, Vectorized):
+        return iterable.sort(key, reverse).slice(None, n, None)
+    key = to_unary(key) if key is not None else None
+    # same items as islice over sorted(), including the lazy iterator the slice stage would have returned
+    return iter(select(n, iterable, key=key))
+
+
+@as_pipeable(name='nsmallest')
+def _take_nsmallest(iterable, n, key=None):
+    return _sorted_prefix(heapq.nsmallest, iterable, n, key, False)
+
+
+@as_pipeable(name='nlargest')
+def _take_nlargest(iterable, n, key=None):
+    return _sorted_prefix(heapq.nlargest, iterable, n, key, True)
+
+
+@rewrite_rule
+def _sort_then_take(p, q):
+    if not _is_stage(p, seq.sort):
+        return None
+    if _is_stage(q, seq.first):
+        n, rest = 1, (q,)
+    elif _is_stage(q, seq.slice) and not q._kwargs and len(q._args) == 2 and q._args[0] is None \
+            and isinstance(q._args[1], int) and q._args[1] >= 0:
+        n, rest = q._args[1], ()
+    else:
+        return None
+    key, reverse = _sort_args(*p._args, **p._kwargs)
+    return ((_take_nlargest if reverse else _take_nsmallest)(n, key=key),) + rest
+
+
+_REDUCERS = {
+    seq.len.__wrapped__: agg.count,
+    seq.sum.__wrapped__: agg.sum,
+    seq.min.__wrapped__: agg.min,
+    seq.max.__wrapped__: agg.max,
+    seq.first.__wrapped__: agg.first,
+    seq.reduce.__wrapped__: agg.fold,
+    seq.aggregate.__wrapped__: lambda **reducers: _combine_reducers(**reducers),
+}
+
+
+def _combine_reducers(**reducers):
+    return agg.combine(**{name: _as_reducer(r) for name, r in reducers.items()})
+
+
+def _as_reducer(obj):
+    if isinstance(obj, Reducer):
+        return obj
+    if isinstance(obj, Function) and obj._func in _REDUCERS:
+        return _REDUCERS[obj._func](*obj._args, **obj._kwargs)
+    raise TypeError(f'{obj} is not a reducer')
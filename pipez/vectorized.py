@@ -0,0 +1,166 @@
+import functools
+import operator
+
+from pipez.functions import to_unary
+from pipez.pipe import Function, Pipeline, All, Any, Not
+
+_UFUNCS = {
+    operator.add: 'add',
+    operator.sub: 'subtract',
+    operator.mul: 'multiply',
+    operator.truediv: 'true_divide',
+    operator.floordiv: 'floor_divide',
+    operator.mod: 'remainder',
+    operator.neg: 'negative',
+    operator.eq: 'equal',
+    operator.ne: 'not_equal',
+    operator.lt: 'less',
+    operator.le: 'less_equal',
+    operator.gt: 'greater',
+    operator.ge: 'greater_equal',
+}
+
+
+class _Fallback(Exception):
+    pass
+
+
+def _numpy():
+    import numpy
+    return numpy
+
+
+def _lower_all(funcs):
+    lowered = [lower(f) for f in funcs]
+    return lowered if all(f is not None for f in lowered) else None
+
+
+def lower(func):
+    np = _numpy()
+
+    if isinstance(func, np.ufunc) and func.nin == 1:
+        return func
+
+    if isinstance(func, Function) and not func._kwargs and func._func in _UFUNCS:
+        ufunc = getattr(np, _UFUNCS[func._func])
+        args = func._args
+
+        def lowered(array):
+            res = ufunc(array, *args)
+            # python raises (e.g. ZeroDivisionError) where numpy quietly produces inf or nan
+            if res.dtype.kind in 'fc' and not np.isfinite(res).all() and np.isfinite(array).all():
+                raise _Fallback
+            return res
+
+        return lowered
+
+    if isinstance(func, Pipeline):
+        if (stages := _lower_all(func._pipes)) is not None:
+            return lambda array: functools.reduce(lambda res, f: f(res), stages, array)
+
+    if isinstance(func, All):
+        if (preds := _lower_all(func._preds)) is not None:
+            return lambda array: functools.reduce(np.logical_and, (p(array) for p in preds))
+
+    if isinstance(func, Any):
+        if (preds := _lower_all(func._preds)) is not None:
+            return lambda array: functools.reduce(np.logical_or, (p(array) for p in preds))
+
+    if isinstance(func, Not):
+        if (pred := lower(func._pred)) is not None:
+            return lambda array: np.logical_not(pred(array))
+
+    return None
+
+
+def _apply(ufunc, array):
+    # returns None whenever numpy could disagree with scalar python, so that the caller falls back to it
+    np = _numpy()
+    with np.errstate(all='ignore'):
+        try:
+            res = np.asarray(ufunc(array))
+            if array.dtype.kind not in 'iu':
+                return res
+            # fixed width integers wrap around silently; redo the work in floating point and reject results
+            # that disagree, letting the caller fall back to python ints
+            shadow = np.asarray(ufunc(array.astype(float)))
+        except (_Fallback, OverflowError, TypeError):
+            # also covers operands too large for a C long and types numpy cannot combine
+            return None
+        if res.dtype.kind == 'b':
+            agrees = np.array_equal(res, shadow)
+        else:
+            agrees = bool(np.all(np.abs(res - shadow) <= 1e-9 * np.abs(shadow) + 1))
+    return res if agrees else None
+
+
+_SCALAR_KINDS = {bool: 'b', int: 'i', float: 'f'}
+
+
+def _from_results(items):
+    kinds = {_SCALAR_KINDS.get(type(item)) for item in items}
+    if len(kinds) == 1 and None not in kinds:
+        array = _numpy().asarray(items)
+        if array.ndim == 1 and array.dtype.kind in kinds:
+            return Vectorized(array)
+    return items
+
+
+class Vectorized:
+    def __init__(self, array):
+        self.array = _numpy().asarray(array)
+
+    @staticmethod
+    def from_iterable(iterable):
+        if isinstance(iterable, Vectorized):
+            return iterable
+        if isinstance(iterable, range):
+            return Vectorized(_numpy().arange(iterable.start, iterable.stop, iterable.step))
+        return _from_results(list(iterable))
+
+    def __iter__(self):
+        return iter(self.array.tolist())
+
+    def __len__(self):
+        return self.array.size
+
+    def __repr__(self):
+        return f'Vectorized({self.array!r})'
+
+    def map(self, func):
+        if (ufunc := lower(func)) is not None and (res := _apply(ufunc, self.array)) is not None:
+            return Vectorized(res)
+        func = to_unary(func)
+        return _from_results([func(item) for item in self])
+
+    def filter(self, pred):
+        np = _numpy()
+        if (ufunc := lower(pred)) is not None and (mask := _apply(ufunc, self.array)) is not None:
+            mask = mask.astype(bool)
+        else:
+            pred = to_unary(pred)
+            mask = np.fromiter((bool(pred(item)) for item in self), dtype=bool, count=len(self))
+        return Vectorized(self.array[mask])
+
+    def slice(self, start, stop, step):
+        return Vectorized(self.array[start:stop:step])
+
+    def sort(self, key, reverse):
+        if key is not None:
+            return Vectorized(sorted(self, key=to_unary(key), reverse=reverse))
+        res = _numpy().sort(self.array)
+        return Vectorized(res[::-1] if reverse else res)
+
+    def sum(self):
+        array = self.array
+        if array.dtype.kind in 'iu' and array.size:
+            bound = max(abs(int(array.min())), abs(int(array.max())))
+            if bound * array.size >= 2 ** 63:
+                return sum(array.tolist())
+        return array.sum().item()
+
+    def min(self):
+        return self.array.min().item()
+
+    def max(self):
+        return self.array.max().item()
@@ -0,0 +1,44 @@
+import pytest
+
+from pipez import agg, seq
+
+
+def test_reducers():
+    rng = [5, 1, 9, 3, 2]
+    assert rng >> agg.count() == 5
+    assert rng >> agg.sum() == 20
+    assert rng >> agg.min() == 1
+    assert rng >> agg.max() == 9
+    assert rng >> agg.mean() == 4
+    assert rng >> agg.first() == 5
+    assert rng >> agg.last() == 2
+    assert rng >> agg.fold(lambda total, item: total * item, 1) == 270
+
+
+def test_min_max_with_key():
+    words = ['bb', 'a', 'ccc', 'd']
+    assert words >> agg.min(key=len) == 'a'
+    assert words >> agg.max(key=len) == 'ccc'
+
+
+def test_empty():
+    assert [] >> agg.count() == 0
+    assert [] >> agg.first() is None
+    with pytest.raises(ValueError):
+        [] >> agg.min()
+    with pytest.raises(ValueError):
+        [] >> agg.mean()
+
+
+def test_fold_starts_each_group_from_a_fresh_state():
+    def append(acc, item):
+        acc.append(item)
+        return acc
+
+    assert range(6) >> seq.group_by(lambda x: x % 2, agg.fold(append, [])) == {0: [0, 2, 4], 1: [1, 3, 5]}
+    assert range(4) >> seq.group_by(lambda x: x % 2, agg.fold(append, factory=list)) == {0: [0, 2], 1: [1, 3]}
+    assert range(4) >> seq.group_by(lambda x: x % 2, agg.combine(items=agg.fold(append, []), n=agg.count())) == \
+           {0: {'items': [0, 2], 'n': 2}, 1: {'items': [1, 3], 'n': 2}}
+    fold = agg.fold(append, [])
+    assert [1] >> fold == [1]
+    assert [2] >> fold == [2]
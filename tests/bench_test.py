@@ -0,0 +1,7 @@
+import pytest
+
+
+def test_every_seq_stage_is_benchmarked():
+    pytest.importorskip('numpy')
+    from benchmarks.bench import uncovered
+    assert uncovered() == []
@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+from evaluate import Stream, Tokens, CompiledTokens, tokenize, read_tokens, evaluate, env, Env, BUILTINS, Memo, \
+    Rule, Any, Seq, Char, Integer
+
+
+def _combinator_scan(stream):
+    while stream:
+        res = Tokens.parse(stream)
+        if res is None:
+            break
+        stream = res.remainder
+        yield res.parser, res.token
+
+
+def test_compiled_tokenizer_matches_combinators():
+    alphabet = ' \t\n[]"\\+-.0123456789abcXYZ²٣\u3000ął|{}>'
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        for start in (0, len(text) // 2):
+            stream = Stream(text).advance(start)
+            assert list(CompiledTokens.scan(stream)) == list(_combinator_scan(stream)), text
+
+            expected, actual = Tokens.parse(stream), CompiledTokens.parse(stream)
+            if expected is None:
+                assert actual is None, text
+            else:
+                assert (actual.token, actual.parser, actual.remainder.index) == \
+                       (expected.token, expected.parser, expected.remainder.index), text
+
+
+def test_combinator_tokens_with_and_without_memo():
+    alphabet = ' \n[]"\\+-.0123456789ab²'
+    rng = random.Random(1)
+    for _ in range(2000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        expected = list(_combinator_scan(Stream(text)))
+        for max_positions in (1, 2, 64):
+            assert list(_combinator_scan(Stream(text, memo=Memo(max_positions)))) == expected, text
+
+
+def test_rule_direct_left_recursion():
+    expr = Rule('Expr')
+    expr.define(Any(Seq(expr, Char('-'), Integer), Integer))
+    res = expr.parse(Stream('1-2-30-4 x', memo=Memo()))
+    assert (res.token.text, res.parser, res.remainder.index) == ('1-2-30-4', expr, 8)
+    assert expr.parse(Stream('x', memo=Memo())) is None
+
+
+def test_rule_indirect_left_recursion():
+    a, b = Rule('A'), Rule('B')
+    b.define(Any(Seq(a, Char('b')), Char('x')))
+    a.define(Any(Seq(b, Char('a')), Char('y')))
+
+    def parse(rule, text):
+        res = rule.parse(Stream(text, memo=Memo()))
+        return res and res.token.text
+
+    assert [parse(a, t) for t in ('xabab', 'yb', 'xa', 'ybab')] == ['xaba', 'y', 'xa', 'yba']
+    assert [parse(b, t) for t in ('xabab', 'yb', 'xa', 'ybab')] == ['xabab', 'yb', 'x', 'ybab']
+
+
+def test_left_recursion_is_linear():
+    calls = []
+    digit = Char(lambda ch: calls.append(ch) or ch.isdigit())
+    expr = Rule('Expr')
+    expr.define(Any(Seq(expr, Char('+'), digit), digit))
+    for n in (100, 200):
+        calls.clear()
+        text = '+'.join('1' * n)
+        assert expr.parse(Stream(text, memo=Memo())).token.text == text
+        assert len(calls) <= 3 * n
+
+
+def test_memo_is_bounded():
+    memo = Memo(max_positions=4)
+    text = ' '.join(['12'] * 50)
+    list(_combinator_scan(Stream(text, memo=memo)))
+    assert len(memo._results) <= 4
+    assert 0 < len(memo) <= 4 * 10
+
+
+def test_recursive_rule_cannot_be_compiled():
+    expr = Rule('Expr')
+    expr.define(Any(Seq(expr, Char('-')), Integer))
+    with pytest.raises(TypeError):
+        expr.compile()
+
+
+def test_tokenize():
+    tokens = list(tokenize(Stream('[+ 1 -2.5\n  "a \\"b\\"" x]')))
+    assert [t.text for t in tokens] == ['[', '+', '1', '-2.5', '"a "b""', 'x', ']']
+    assert [t.pos for t in tokens] == [(0, 0), (0, 1), (0, 3), (0, 5), (1, 2), (1, 12), (1, 13)]
+    assert read_tokens(iter(tokens)) == [['+', 1, -2.5, '"a "b""', 'x']]
+
+
+def _run(source, environment):
+    return evaluate(read_tokens(tokenize(Stream(source)))[0], environment)
+
+
+def test_user_globals_are_looked_up_dynamically():
+    environment = Env({}, outer=env)
+    _run('[g := [[y] -> [+ y 1]]]', environment)
+    _run('[h := [[y] -> [g y]]]', environment)
+    assert _run('[h 3]', environment) == 4
+    _run('[g := [[y] -> [* y 10]]]', environment)
+    assert _run('[h 3]', environment) == 30
+
+
+def test_builtins_can_be_shadowed():
+    assert _run('[begin [+ := [[a b] -> [* a b]]] [+ 6 7]]', Env({}, outer=env)) == 42
+    assert _run('[+ 6 7]', Env({}, outer=env)) == 13
+    assert BUILTINS['+'] is env['+']
+
+    environment = Env({}, outer=env)
+    _run('[f := [[x] -> [+ x 1]]]', environment)
+    assert _run('[f 5]', environment) == 6
+    _run('[+ := [[a b] -> [* a b]]]', environment)
+    assert _run('[f 5]', environment) == 5
+
+
+def test_lambda_scopes():
+    environment = Env({}, outer=env)
+    assert _run('[begin [fact := [[n] -> [if [<= n 1] 1 [* n [fact [- n 1]]]]]] [fact 10]]', environment) == 3628800
+    assert _run('[[[[[a] -> [[b] -> [[c] -> [| a b c |]]]] 1] 2] 3]', environment) == [1, 2, 3]
+    assert _run('[begin [x := 5] [f := [[y] -> [begin [if [> y 0] [x := 100] 0] [+ x y]]]] [| [f 1] [f 0] x |]]',
+                environment) == [101, 5, 5]
+    assert _run('[[[[a b] -> [+ a b]] 1] 2]', environment) == 3
@@ -0,0 +1,40 @@
+import operator
+
+from pipez.functions import to_unary, identity
+
+
+def add(a, b):
+    return a + b
+
+
+def test_to_unary_none():
+    assert to_unary(None) is identity
+
+
+def test_to_unary_value():
+    assert to_unary(3)(3)
+    assert not to_unary(3)(4)
+
+
+def test_to_unary_unary_function():
+    assert to_unary(len) is len
+    assert to_unary(operator.itemgetter(0)) is not None
+    assert to_unary(operator.add) is operator.add
+
+
+def test_to_unary_spreads_arguments():
+    assert to_unary(add)((2, 3)) == 5
+    assert to_unary(lambda a, b=1: a + b)(2) == 3
+
+
+def test_to_unary_reuses_adapters():
+    adapter = to_unary(add)
+    assert to_unary(add) is adapter
+    assert to_unary(adapter) is adapter
+
+
+def test_precomputed_arg_counts_match_signatures():
+    from pipez.functions import _MODULE_FUNCTIONS, _count_from_signature
+
+    for func, count in _MODULE_FUNCTIONS.items():
+        assert (count > 1) == (_count_from_signature(func) > 1), func
@@ -0,0 +1,66 @@
+import json
+import time
+
+from pipez import seq
+from pipez.instrument import Profiler
+from pipez.pipe import Pipeline, Pipeable
+
+
+def sqr(x):
+    return x * x
+
+
+def is_even(x):
+    return x % 2 == 0
+
+
+def test_profiler_records_stages():
+    pipeline = seq.map(sqr) >> seq.filter(is_even) >> seq.take(3) >> seq.to_list()
+    with Profiler() as profiler:
+        assert range(100) >> pipeline == [0, 4, 16]
+        assert range(4) >> seq.sum() == 6
+
+    stats = profiler.stats
+    assert stats['map(sqr)'].calls == 1
+    assert stats['map(sqr)'].items_out == 5
+    assert stats['take_if(is_even)'].items_in == 5
+    assert stats['take_if(is_even)'].items_out == 3
+    assert stats['slice(None, 3)'].items_in == 3
+    assert stats['to(list)'].items_in == 3
+    assert stats['sum()'].calls == 1
+    assert 'map(sqr)' in profiler.table()
+
+
+def test_profiler_restores_pipeline():
+    call, rrshift = Pipeline.__call__, Pipeable.__rrshift__
+    with Profiler():
+        assert Pipeline.__call__ is not call
+    assert Pipeline.__call__ is call
+    assert Pipeable.__rrshift__ is rrshift
+
+
+def test_profiler_chrome_trace(tmp_path):
+    with Profiler(trace_malloc=True) as profiler:
+        range(10) >> seq.map(str) >> seq.to_list()
+    path = tmp_path / 'trace.json'
+    profiler.to_chrome_trace(path)
+    events = json.loads(path.read_text())['traceEvents']
+    assert {e['name'] for e in events} == {'map(str)', 'to(list)'}
+    assert profiler.stats['to(list)'].allocated > 0
+
+
+def test_profiler_separates_self_time():
+    def slow(x):
+        time.sleep(0.002)
+        return x
+
+    with Profiler() as profiler:
+        range(20) >> seq.map(slow) >> seq.filter(is_even) >> seq.map(str) >> seq.to_list()
+
+    stats = profiler.stats
+    slow_stage = stats['map(slow)']
+    assert slow_stage.self_time >= 0.03
+    for name in ('take_if(is_even)', 'map(str)', 'to(list)'):
+        assert stats[name].wall_time >= 0.03
+        assert stats[name].self_time < slow_stage.self_time / 5
+    assert profiler.table().splitlines()[2].startswith('map(slow)')
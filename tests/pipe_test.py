@@ -0,0 +1,58 @@
+from pipez import seq
+from pipez.pipe import Pipeline, Fused
+
+
+def fibonacci():
+    a, b = 0, 1
+    while True:
+        a, b = b, a + b
+        yield a
+
+
+def sqr(x):
+    return x * x
+
+
+def is_even(x):
+    return x % 2 == 0
+
+
+def test_compile_fuses_adjacent_stages():
+    pipeline = seq.map(sqr) >> seq.filter(is_even) >> seq.take_while(lambda x: x < 50) >> seq.to_list()
+    compiled = pipeline.compile()
+    assert len(compiled._pipes) == 2
+    assert isinstance(compiled._pipes[0], Fused)
+    assert range(20) >> compiled == range(20) >> pipeline == [0, 4, 16, 36]
+
+
+def test_compile_is_lazy():
+    visited = []
+    pipeline = (seq.inspect(visited.append)
+                >> seq.map(sqr)
+                >> seq.take_until(lambda x: x > 100)
+                >> seq.filter(is_even)).compile()
+    res = fibonacci() >> pipeline
+    assert visited == []
+    assert list(res) == [4, 64]
+    assert visited == [1, 1, 2, 3, 5, 8, 13]
+
+
+def test_auto_compile():
+    Pipeline.auto_compile = True
+    try:
+        pipeline = seq.map(sqr) >> seq.filter(is_even) >> seq.map(str)
+    finally:
+        Pipeline.auto_compile = False
+    assert len(pipeline._pipes) == 1
+    assert list(range(5) >> pipeline) == ['0', '4', '16']
+
+
+def test_set_name_does_not_rename_shared_stages():
+    head = seq.first().set_name('head')
+    assert str(head) == 'head()'
+    assert str(seq.first()) == 'first()'
+    assert [3, 4] >> head == 3
+
+    listed = seq.to_list().set_name('listed')
+    assert str(seq.to_list()) == 'to(list)'
+    assert range(2) >> listed == [0, 1]
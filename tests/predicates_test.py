@@ -1,5 +1,11 @@
+import mmap
+from array import array
+
+import pytest
+
 from pipez.predicates import ge, is_none, is_empty, lt, ne, contains, each, eq, size_is, has_prefix, has_suffix, \
-    contains_subrange
+    contains_subrange, contains_any_subrange, adaptive_all_of, each_has_prefix, each_has_suffix, compile, \
+    result_of, always, never, gt
 
 
 def test_all():
@@ -78,3 +84,101 @@ def test_contains_subrange():
     assert '01234' >> contains_123
     assert not '12' >> contains_123
     assert not '' >> contains_123
+
+
+def test_adaptive_all_of():
+    calls = []
+
+    def expensive(x):
+        calls.append(x)
+        return sum(range(1000)) and x % 7 == 0
+
+    pred = adaptive_all_of(expensive, lt(10), sample_every=2, reorder_every=20)
+    assert [x for x in range(100) if pred(x)] == [0, 7]
+    assert str(pred).startswith('all(lt(10)')
+    calls.clear()
+    assert [x for x in range(100, 200) if pred(x)] == []
+    assert calls == []
+
+
+def test_adaptive_any_of():
+    pred = (eq(3) | ge(0)).adaptive(sample_every=1, reorder_every=10)
+    assert [x for x in range(-5, 20) if pred(x)] == list(range(0, 20))
+    assert str(pred).startswith('any(ge(0)')
+
+
+def test_adaptive_sampling_short_circuits():
+    pred = (is_none | gt(3)).adaptive(sample_every=2)
+    assert [pred(x) for x in (None, None, 5, 1)] == [True, True, True, False]
+    pred = (~is_none & gt(3)).adaptive(sample_every=2)
+    assert [pred(x) for x in (None, None, 5, 1)] == [False, False, True, False]
+
+
+def test_contains_subrange_sequences():
+    assert [1, 2, 1, 2, 3] >> contains_subrange([1, 2, 3])
+    assert not (1, 2, 1, 2) >> contains_subrange((2, 2))
+    assert b'\x00abc' >> contains_subrange(b'bc')
+    assert memoryview(b'\x00abc') >> contains_subrange(b'ab')
+    assert [] >> contains_subrange([])
+
+
+def test_contains_subrange_typed_buffers():
+    assert not memoryview(array('i', [256, 0])) >> contains_subrange(memoryview(array('i', [1])))
+    assert memoryview(array('i', [7, 256, 0])) >> contains_subrange(memoryview(array('i', [256, 0])))
+    assert not memoryview(array('b', [-1])) >> contains_subrange(b'\xff')
+    assert memoryview(bytearray(b'xyz'))[1:] >> contains_subrange(memoryview(b'yz'))
+    assert not memoryview(array('i', [256, 0])) >> contains_any_subrange([memoryview(array('i', [1]))])
+    assert memoryview(array('i', [7, 256])) >> contains_any_subrange([memoryview(array('i', [256]))])
+
+
+def test_contains_any_subrange():
+    pred = contains_any_subrange(['he', 'she', 'his', 'hers'])
+    assert 'ushers' >> pred
+    assert 'this' >> pred
+    assert not 'abc' >> pred
+    assert ['a', 'b', 'h', 'e'] >> pred
+    assert b'xhersx' >> contains_any_subrange([b'hers'])
+
+
+def test_has_prefix_suffix_buffers():
+    payload = b'HDR:body:END'
+    assert payload >> has_prefix(b'HDR')
+    assert memoryview(payload) >> has_prefix(b'HDR')
+    assert bytearray(payload) >> has_suffix(memoryview(b'END'))
+    assert memoryview(payload) >> has_suffix(b'END')
+    assert not memoryview(b'EN') >> has_suffix(b'END')
+    assert [1, 2, 3] >> has_prefix([1, 2])
+    assert [1, 2, 3] >> has_suffix([])
+
+    buffer = mmap.mmap(-1, len(payload))
+    buffer.write(payload)
+    assert buffer >> has_prefix(b'HDR')
+    assert buffer >> has_suffix(b':END')
+    assert not buffer >> has_suffix(b'HDR')
+
+
+def test_each_has_prefix_suffix():
+    buffers = [b'HDR:1', b'XXX:2', memoryview(b'HDR:3')]
+    assert buffers >> each_has_prefix(b'HDR') == [True, False, True]
+    assert buffers >> each_has_suffix(b'2') == [False, True, False]
+    assert ['abc', 'xbc'] >> each_has_prefix('a') == [True, False]
+
+
+def test_compile():
+    pred = (ge(0) & lt(5) & ne(3)) | eq(9) | result_of(abs, ge(100))
+    compiled = compile(pred)
+    for arg in [-1, 0, 1, 2, 3, 4, 5, 8, 9]:
+        assert compiled(arg) == pred(arg)
+    assert compile(~is_none)(3)
+    assert not compile(~is_none)(None)
+    assert compile(contains_subrange('123') & has_prefix('0'))('0123')
+
+
+def test_compile_keeps_stages_before_constants():
+    for pred in (result_of(len, always), result_of(len, never), result_of(len, always | gt(1))):
+        with pytest.raises(TypeError):
+            pred(5)
+        with pytest.raises(TypeError):
+            compile(pred)(5)
+        assert compile(pred)([1, 2]) == pred([1, 2])
+    assert compile(always)(None)
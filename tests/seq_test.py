@@ -1,4 +1,10 @@
-from pipez import seq
+import asyncio
+
+import pytest
+
+from pipez import seq, agg
+from pipez.functions import identity
+from pipez.operators import get_item, mul, add, combine, truediv
 from pipez.pipe import fn
 
 
@@ -21,6 +27,10 @@ def is_odd(x):
     return x % 2 != 0
 
 
+def plus(x, y):
+    return x + y
+
+
 def test_map():
     assert list(range(5) >> seq.map(sqr)) == [0, 1, 4, 9, 16]
 
@@ -145,3 +155,245 @@ def test_nth():
 
 def test_extend():
     assert list(fibonacci() >> seq.take(5) >> seq.extend(range(100, 103))) == [1, 1, 2, 3, 5, 100, 101, 102]
+
+
+def test_pmap():
+    assert list(range(10) >> seq.pmap(sqr, workers=4)) == [0, 1, 4, 9, 16, 25, 36, 49, 64, 81]
+    assert list(fibonacci() >> seq.pmap(sqr, workers=2, chunksize=3) >> seq.take(5)) == [1, 1, 4, 9, 25]
+    assert sorted(range(10) >> seq.pmap(sqr, ordered=False)) == [0, 1, 4, 9, 16, 25, 36, 49, 64, 81]
+    assert list(range(-3, 0) >> seq.pmap(abs, workers=2, executor='process')) == [3, 2, 1]
+    assert list([(1, 2), (3, 4)] >> seq.pmap(plus, workers=2, executor='process')) == [3, 7]
+    assert list([(1, 2), (3, 4)] >> seq.pmap(plus, workers=2)) == [3, 7]
+    for kwargs in ({'chunksize': 0}, {'chunksize': -1}, {'workers': 0}):
+        with pytest.raises(ValueError):
+            range(3) >> seq.pmap(sqr, **kwargs)
+        with pytest.raises(ValueError):
+            range(3) >> seq.pfilter(is_even, **kwargs)
+
+
+def test_pfilter():
+    assert list(range(10) >> seq.pfilter(is_even, workers=4, chunksize=2)) == [0, 2, 4, 6, 8]
+    assert list(fibonacci() >> seq.pfilter(is_even, workers=2) >> seq.take(3)) == [2, 8, 34]
+    assert sorted(range(10) >> seq.pfilter(is_odd, ordered=False)) == [1, 3, 5, 7, 9]
+
+
+async def async_fibonacci():
+    for item in fibonacci():
+        yield item
+
+
+def test_amap():
+    async def slow_sqr(x):
+        await asyncio.sleep(0.01 * (5 - x))
+        return sqr(x)
+
+    assert asyncio.run(range(5) >> seq.amap(slow_sqr, concurrency=3) >> seq.ato_list()) == [0, 1, 4, 9, 16]
+    assert asyncio.run(async_fibonacci() >> seq.amap(sqr) >> seq.atake(5) >> seq.ato_list()) == [1, 1, 4, 9, 25]
+
+
+def test_afilter():
+    async def async_is_even(x):
+        return is_even(x)
+
+    assert asyncio.run(async_fibonacci()
+                       >> seq.afilter(async_is_even, concurrency=4)
+                       >> seq.atake(3)
+                       >> seq.ato_list()) == [2, 8, 34]
+
+
+def test_afor_each():
+    res = []
+    asyncio.run(async_fibonacci() >> seq.atake(5) >> seq.afor_each(res.append))
+    assert res == [1, 1, 2, 3, 5]
+
+
+def test_chunk():
+    assert list(range(7) >> seq.chunk(3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(fibonacci() >> seq.chunk(2) >> seq.take(2)) == [[1, 1], [2, 3]]
+
+
+def test_unbatch():
+    assert list(range(7) >> seq.chunk(3) >> seq.unbatch()) == [0, 1, 2, 3, 4, 5, 6]
+    for n in (0, -1):
+        with pytest.raises(ValueError):
+            range(3) >> seq.chunk(n)
+        with pytest.raises(ValueError):
+            range(3) >> seq.batch_map(list, size=n)
+
+
+def test_batch_map():
+    batches = []
+
+    def sqr_all(items):
+        batches.append(len(items))
+        return [sqr(x) for x in items]
+
+    assert list(range(7) >> seq.batch_map(sqr_all, size=3)) == [0, 1, 4, 9, 16, 25, 36]
+    assert batches == [3, 3, 1]
+    assert list(fibonacci() >> seq.batch_map(sqr_all, size=2, max_latency=0) >> seq.take(3)) == [1, 1, 4]
+
+
+def test_vectorize():
+    np = pytest.importorskip('numpy')
+    from pipez.predicates import lt, gt
+
+    assert (range(10)
+            >> seq.vectorize()
+            >> seq.map(mul(3))
+            >> seq.filter(gt(5) & lt(20))
+            >> seq.to_list()) == [6, 9, 12, 15, 18]
+    assert range(101) >> seq.vectorize() >> seq.sum() == 5050
+    assert range(10) >> seq.vectorize() >> seq.map(sqr) >> seq.filter(is_even) >> seq.sum() == 120
+    assert range(10) >> seq.vectorize() >> seq.count_if(~lt(7)) == 3
+    assert seq.from_array(np.array([5, 1, 9, 3])) >> seq.max() == 9
+    assert seq.from_array(np.array([5, 1, 9, 3])) >> seq.min() == 1
+    assert seq.from_array(np.array([5, 1, 9, 3])) >> seq.sort(reverse=True) >> seq.take(2) >> seq.to_list() == [9, 5]
+    assert seq.from_array(np.array([5, 1, 9, 3])) >> seq.map(add(1) >> mul(2)) >> seq.to_list() == [12, 4, 20, 8]
+
+
+def test_vectorize_keeps_python_semantics():
+    np = pytest.importorskip('numpy')
+    from pipez.predicates import gt
+    from pipez.vectorized import Vectorized
+
+    assert range(4 * 10 ** 6) >> seq.vectorize() >> seq.map(sqr) >> seq.sum() == 21333325333334000000
+    assert [2 ** 62, 2 ** 62] >> seq.vectorize() >> seq.map(mul(4)) >> seq.to_list() == [2 ** 64, 2 ** 64]
+    assert [4 * 10 ** 9] >> seq.vectorize() >> seq.filter(mul(4 * 10 ** 9) >> gt(0)) >> seq.to_list() == [4 * 10 ** 9]
+    assert range(5) >> seq.vectorize() >> seq.map(lambda x: (x, 2 * x)) >> seq.len() == 5
+    assert range(3) >> seq.vectorize() >> seq.map(lambda x: (x, 2 * x)) >> seq.to_list() == [(0, 0), (1, 2), (2, 4)]
+    assert range(3) >> seq.vectorize() >> seq.map(lambda x: [0] * x) >> seq.to_list() == [[], [0], [0, 0]]
+    assert range(3) >> seq.vectorize() >> seq.map(lambda x: x / 2 if x else x) >> seq.to_list() == [0, 0.5, 1.0]
+    assert isinstance(seq.from_array(np.arange(3)) >> seq.map(lambda x: x + 1), Vectorized)
+    assert range(3) >> seq.vectorize() >> seq.map(add(2 ** 70)) >> seq.to_list() == [2 ** 70, 2 ** 70 + 1, 2 ** 70 + 2]
+    assert [1.0, 2.0] >> seq.vectorize() >> seq.map(truediv(2)) >> seq.to_list() == [0.5, 1.0]
+    with pytest.raises(TypeError):
+        range(3) >> seq.vectorize() >> seq.filter(gt('a')) >> seq.to_list()
+    for data in ([1.0, 2.0], range(2)):
+        with pytest.raises(ZeroDivisionError):
+            data >> seq.vectorize() >> seq.map(truediv(0)) >> seq.to_list()
+        with pytest.raises(ZeroDivisionError):
+            data >> seq.vectorize() >> seq.filter(truediv(0) >> gt(1)) >> seq.to_list()
+
+
+def test_nsmallest_nlargest():
+    rng = [5, 3, 1, 4, 2, 0]
+    assert rng >> seq.nsmallest(3) == [0, 1, 2]
+    assert rng >> seq.nlargest(2) == [5, 4]
+    assert ['bb', 'a', 'ccc'] >> seq.nsmallest(1, key=len) == ['a']
+
+
+def test_sort_then_take_is_rewritten():
+    top_3 = seq.sort(reverse=True) >> seq.take(3) >> seq.to_list()
+    assert 'nlargest' in str(top_3)
+    assert [5, 3, 1, 4, 2, 0] >> top_3 == [5, 4, 3]
+
+    shortest = seq.sort(key=len) >> seq.first()
+    assert 'nsmallest' in str(shortest)
+    assert ['bb', 'a', 'ccc'] >> shortest == 'a'
+    assert [] >> shortest is None
+
+
+def test_sort_then_take_keeps_stage_output():
+    top_2 = seq.sort() >> seq.take(2)
+    it = [3, 1, 2] >> top_2
+    assert next(it) == 1
+    assert list(it) == [2]
+
+
+def test_sort_then_take_vectorized():
+    np = pytest.importorskip('numpy')
+    from pipez.vectorized import Vectorized
+
+    res = seq.from_array(np.array([5, 1, 9, 3])) >> (seq.sort(reverse=True) >> seq.take(2))
+    assert isinstance(res, Vectorized)
+    assert list(res) == [9, 5]
+    assert seq.from_array(np.array([5, 1, 9, 3])) >> (seq.sort() >> seq.first()) == 1
+
+
+def test_external_sort(tmp_path):
+    rng = [5, 3, 1, 4, 2, 0, 9, 7, 8, 6]
+    assert list(rng >> seq.external_sort(max_items_in_memory=3, tmpdir=tmp_path)) == list(range(10))
+    assert list(rng >> seq.external_sort(reverse=True, max_items_in_memory=4)) == list(reversed(range(10)))
+    assert list(rng >> seq.external_sort(key=lambda x: x % 3, max_items_in_memory=2)) == sorted(rng, key=lambda x: x % 3)
+    assert rng >> seq.external_sort(max_items_in_memory=3) >> seq.take(2) >> seq.to_list() == [0, 1]
+    assert [] >> seq.external_sort() >> seq.first() is None
+    assert list(range(6, 0, -1) >> seq.external_sort(max_items_in_memory=3)) == [1, 2, 3, 4, 5, 6]
+    with pytest.raises(ValueError, match='max_items_in_memory'):
+        rng >> seq.external_sort(max_items_in_memory=0)
+
+
+def test_group_by():
+    rng = [1, 2, 3, 4, 5, 6, 7]
+    assert rng >> seq.group_by(is_even, agg.count()) == {False: 4, True: 3}
+    assert rng >> seq.group_by(is_even, agg.sum()) == {False: 16, True: 12}
+    assert rng >> seq.group_by(is_even, agg.mean()) == {False: 4.0, True: 4.0}
+    assert rng >> seq.group_by(is_even, agg.fold(lambda total, item: total * item, 1)) == {False: 105, True: 48}
+    assert rng >> seq.group_by(lambda x: x % 3, seq.max()) == {1: 7, 2: 5, 0: 6}
+    assert rng >> seq.group_by(lambda x: x % 3, seq.first()) == {1: 1, 2: 2, 0: 3}
+    starts = []
+    counting = agg.fold(lambda total, item: total + 1, factory=lambda: starts.append(1) or 0)
+    assert rng >> seq.group_by(is_even, counting) == {False: 4, True: 3}
+    assert len(starts) == 2
+
+
+def test_group_adjacent():
+    words = ['apple', 'avocado', 'banana', 'blueberry', 'cherry', 'apricot']
+    assert list(words >> seq.group_adjacent(lambda w: w[0])) == [
+        ('a', ['apple', 'avocado']), ('b', ['banana', 'blueberry']), ('c', ['cherry']), ('a', ['apricot'])]
+    assert list(words >> seq.group_adjacent(lambda w: w[0], agg=agg.last())) == [
+        ('a', 'avocado'), ('b', 'blueberry'), ('c', 'cherry'), ('a', 'apricot')]
+    assert list(fibonacci() >> seq.group_adjacent(is_odd, agg.count()) >> seq.take(3)) == [
+        (True, 2), (False, 1), (True, 2)]
+
+
+def test_aggregate():
+    assert [5, 1, 9, 3, 2] >> seq.aggregate(total=seq.sum(), lo=seq.min(), hi=seq.max(), n=seq.len()) == {
+        'total': 20, 'lo': 1, 'hi': 9, 'n': 5}
+    assert fibonacci() >> seq.take(10) >> seq.aggregate(first=seq.first(), mean=agg.mean()) == {
+        'first': 1, 'mean': 14.3}
+    assert range(6) >> seq.group_by(is_even, seq.aggregate(n=seq.len(), hi=seq.max())) == {
+        True: {'n': 3, 'hi': 4}, False: {'n': 3, 'hi': 5}}
+
+
+def test_partition_bounded():
+    t, f = range(10) >> seq.partition(is_even, max_buffer=2)
+    with pytest.raises(BufferError):
+        list(t)
+
+    t, f = range(10) >> seq.partition(is_even, max_buffer=2, spill=True)
+    assert list(t) == [0, 2, 4, 6, 8]
+    assert list(f) == [1, 3, 5, 7, 9]
+
+    t, f = fibonacci() >> seq.partition(is_even, max_buffer=1, spill=True)
+    assert list(t >> seq.take(3)) == [2, 8, 34]
+    assert list(f >> seq.take(6)) == [1, 1, 3, 5, 13, 21]
+    assert list(t >> seq.take(1)) == [144]
+
+
+def test_tee_bounded():
+    a, b, c = range(5) >> seq.tee(3, max_buffer=2, spill=True)
+    assert list(a) == [0, 1, 2, 3, 4]
+    assert list(zip(b, c)) == [(0, 0), (1, 1), (2, 2), (3, 3), (4, 4)]
+
+
+def test_partition_into():
+    evens, odds = [], []
+    range(10) >> seq.partition_into(is_even, evens.append, odds.append)
+    assert evens == [0, 2, 4, 6, 8]
+    assert odds == [1, 3, 5, 7, 9]
+
+
+def test_columns():
+    rows = [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}, {'a': 3, 'b': 'z'}]
+    assert rows >> seq.columns(get_item('a'), get_item('b')) == ([1, 2, 3], ['x', 'y', 'z'])
+    assert iter(rows) >> seq.columns(lambda row: row['a'] * 10) == ([10, 20, 30],)
+    assert combine(get_item('b'), get_item('a')).over_batch(rows) == (['x', 'y', 'z'], [1, 2, 3])
+    assert range(7) >> seq.chunk(3) >> seq.map(seq.columns(identity, sqr)) >> seq.to_list() == [
+        ([0, 1, 2], [0, 1, 4]), ([3, 4, 5], [9, 16, 25]), ([6], [36])]
+
+
+def test_columns_as_arrays():
+    pytest.importorskip('numpy')
+    rows = [{'a': 1}, {'a': 2}, {'a': 3}]
+    a, = rows >> seq.columns(get_item('a'), as_arrays=True)
+    assert a >> seq.map(mul(2)) >> seq.sum() == 12